@@ -0,0 +1,157 @@
+from games import add_player, create_game, handle_game_move
+from deltas import record_change, snapshot
+from chat import MAX_MESSAGE_BYTES, append_message
+from locks import StripedLocks
+from timing import timed
+
+# How many times a write is retried when another request changed the game first
+CAS_RETRIES = 5
+
+
+class ActionError(Exception):
+    """A rejected action; message and status become the error response"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+class VersionConflict(ActionError):
+    """The game is no longer at the version the client expected"""
+
+    def __init__(self, game):
+        super().__init__('Game has changed', 409)
+        self.game = game
+
+
+def check_version(game, expected_version):
+    """Raise VersionConflict unless a loaded game is at expected_version (None skips the check)"""
+    if expected_version is None or game is None:
+        return
+    if not isinstance(expected_version, int) or isinstance(expected_version, bool):
+        raise ActionError('Invalid request')
+    if game['version'] != expected_version:
+        raise VersionConflict(game)
+
+
+def apply_join(game, player):
+    """Seat a player in a loaded game (None if missing), returning their index"""
+    if game is None:
+        raise ActionError('Invalid or full game code')
+
+    player_index = add_player(game['type'], game['state'], player)
+    if player_index is None:
+        raise ActionError('Invalid or full game code')
+    return player_index
+
+
+def apply_move(game, idx, player):
+    """Apply a player's move to a loaded game (None if missing)"""
+    if game is None or player not in game['state']['players']:
+        raise ActionError('Invalid request')
+    if not isinstance(idx, int) or isinstance(idx, bool):
+        raise ActionError('Invalid request')
+
+    game_state = game['state']
+    game_type = game['type']
+
+    try:
+        player_index = game_state['players'].index(player)
+    except ValueError:
+        raise ActionError('Player not found')
+
+    if game_state['turn'] != player_index or game_state['game_over']:
+        raise ActionError('Not your turn')
+
+    with timed('handle_game_move'):
+        success, updated_state = handle_game_move(game_type, game_state, player_index, idx)
+    if not success:
+        raise ActionError('Invalid move')
+
+    game['state'] = updated_state
+
+
+def apply_message(game, player, message):
+    """Append a chat message to a loaded game (None if missing), returning it"""
+    if not isinstance(message, str) or not message:
+        raise ActionError('Invalid request')
+    if len(message.encode()) > MAX_MESSAGE_BYTES:
+        raise ActionError('Message too long')
+    if game is None or player not in game['state']['players']:
+        raise ActionError('Invalid request')
+
+    player_index = game['state']['players'].index(player)
+    return append_message(game, player_index, message)
+
+
+class GameActions:
+    """Game writes shared by the HTTP routes, /batch and the Socket.IO gateway.
+
+    Each action reads the game, applies the change and writes it back with
+    compare-and-set, retrying if another worker changed the game in
+    between. Within this process writes to a game are serialized by its
+    striped lock, so threads don't race each other into retries. Every
+    write also logs its patch for delta responses, and requests waiting on
+    the game are woken afterwards.
+    """
+
+    def __init__(self, games, waiters, new_code, locks=None):
+        self.games = games
+        self.waiters = waiters
+        self.new_code = new_code
+        self.locks = locks or StripedLocks()
+
+    def load(self, code):
+        """Return the game (or None) and a snapshot of it before any changes"""
+        with timed('lookup'):
+            game = self.games.get(code)
+        if game is None:
+            return None, None
+        return game, snapshot(game)
+
+    def commit(self, code, game, before):
+        """Write back a loaded game, returning False if it changed meanwhile"""
+        record_change(game, before)
+        if self.games.compare_and_set(code, game['version'], game) is None:
+            return False
+        self.waiters.notify(code)
+        return True
+
+    def update(self, code, apply, expected_version=None):
+        """Run apply(game) on the latest copy of a game and commit it.
+
+        Returns (game, whatever apply returned). apply may be called again
+        if another request wins the race to write the game. With an
+        expected_version the write only happens while the game is still at
+        that version, otherwise VersionConflict carries the current game.
+        """
+        with self.locks.lock_for(code):
+            for _ in range(CAS_RETRIES):
+                game, before = self.load(code)
+                check_version(game, expected_version)
+                result = apply(game)
+                if self.commit(code, game, before):
+                    return game, result
+        raise ActionError('Game is busy, try again', 409)
+
+    def create(self, game_type):
+        """Create a game under a fresh code and return the code"""
+        game = {'type': game_type, 'state': create_game(game_type)}
+        # Inserting only when the code is unused keeps codes unique across workers
+        code = self.new_code()
+        while self.games.compare_and_set(code, None, game) is None:
+            code = self.new_code()
+        return code
+
+    def join(self, code, player, expected_version=None):
+        """Add a player to a game, returning (game, player_index)"""
+        return self.update(code, lambda game: apply_join(game, player), expected_version)
+
+    def move(self, code, idx, player, expected_version=None):
+        """Apply a player's move, returning the updated game"""
+        return self.update(code, lambda game: apply_move(game, idx, player), expected_version)[0]
+
+    def send_message(self, code, player, message):
+        """Append a chat message, returning (game, message entry)"""
+        return self.update(code, lambda game: apply_message(game, player, message))
@@ -0,0 +1,142 @@
+import copy
+
+from actions import CAS_RETRIES, ActionError, apply_join, apply_message, apply_move, check_version
+from games import GAME_HANDLERS, game_view
+from logs import get_logger
+
+logger = get_logger('batch')
+
+# Most operations accepted in one /batch request
+MAX_BATCH_OPS = 500
+
+BATCH_OPS = ('create_game', 'join_game', 'make_move', 'send_message', 'game_state')
+
+
+def _ok(payload):
+    return dict(payload, ok=True)
+
+
+def _error(message, status=400):
+    return {'ok': False, 'error': message, 'status': status}
+
+
+def _resolve_code(code, results):
+    """Turn a "$n" reference into the code created by operation n"""
+    if isinstance(code, str) and code.startswith('$'):
+        try:
+            result = results[int(code[1:])]
+        except (ValueError, IndexError, TypeError):
+            result = None
+        if not result or not result['ok'] or 'code' not in result:
+            raise ActionError('Unknown game reference')
+        return result['code']
+    return code
+
+
+def _apply(game, op):
+    """Apply one operation to a loaded game and return its result payload.
+
+    A 'version' key in the payload is filled in once the game is written.
+    """
+    check_version(game, op.get('expected_version'))
+    name = op['op']
+    if name == 'join_game':
+        player_index = apply_join(game, op.get('player'))
+        return {'player_index': player_index, 'players': list(game['state']['players'])}
+    if name == 'make_move':
+        apply_move(game, op.get('index'), op.get('player'))
+        return {'state': copy.deepcopy(game_view(game['type'], game['state'])), 'version': None}
+    if name == 'send_message':
+        return {'id': apply_message(game, op.get('player'), op.get('message'))['id']}
+    if game is None:
+        raise ActionError('Game not found', 404)
+    return {'state': copy.deepcopy(game_view(game['type'], game['state'])), 'version': None}
+
+
+def _finish(payload, game):
+    """Fill in the version a payload's state was written at (None if it never was)"""
+    if 'version' in payload:
+        payload['version'] = game['version'] if game is not None else None
+    return _ok(payload)
+
+
+def _run_group(actions, code, indices, ops, results):
+    """Apply every operation on one game to a single copy and commit once"""
+    with actions.locks.lock_for(code):
+        for _ in range(CAS_RETRIES):
+            game, before = actions.load(code)
+            payloads = []
+            error = None
+            try:
+                for i in indices:
+                    payloads.append(_apply(game, ops[i]))
+            except ActionError as e:
+                error = _error(e.message, e.status)
+            except Exception as e:
+                logger.exception('Batch operation failed', extra={'op': ops[indices[len(payloads)]]['op']})
+                error = _error(str(e), 500)
+            if error is not None:
+                failed = len(payloads)
+                for n, i in enumerate(indices):
+                    results[i] = error if n == failed else _error('Rolled back', 409)
+                return
+
+            read_only = all(ops[i]['op'] == 'game_state' for i in indices)
+            if read_only or actions.commit(code, game, before):
+                # Only the last operation's state is the one committed; earlier
+                # snapshots were never stored under any version
+                last = len(indices) - 1
+                for n, (i, payload) in enumerate(zip(indices, payloads)):
+                    results[i] = _finish(payload, game if read_only or n == last else None)
+                return
+
+    for i in indices:
+        results[i] = _error('Game is busy, try again', 409)
+
+
+def run_batch(actions, ops, atomic=False):
+    """Run operations in order and return one result per operation.
+
+    Each operation is a dict with an 'op' name from BATCH_OPS and the same
+    fields as the matching endpoint. A code of "$n" refers to the game
+    created by operation n of the same batch. With atomic set, the writes
+    to each game are applied to one copy and committed together, so either
+    all of a game's operations take effect or none of them do.
+    """
+    results = [None] * len(ops)
+    groups = {}  # game_code: indices of its operations, in order (atomic mode)
+    for i, op in enumerate(ops):
+        try:
+            if not isinstance(op, dict) or op.get('op') not in BATCH_OPS:
+                raise ActionError('Unknown operation')
+
+            if op['op'] == 'create_game':
+                game_type = op.get('game_type')
+                if game_type not in GAME_HANDLERS:
+                    game_type = 'tic-tac-toe'
+                results[i] = _ok({'code': actions.create(game_type)})
+                continue
+
+            code = _resolve_code(op.get('code'), results)
+            if atomic:
+                groups.setdefault(code, []).append(i)
+            elif op['op'] == 'game_state':
+                game = actions.games.read(code)
+                results[i] = _finish(_apply(game, op), game)
+            else:
+                game, payload = actions.update(code, lambda game: _apply(game, op))
+                results[i] = _finish(payload, game)
+        except ActionError as e:
+            results[i] = _error(e.message, e.status)
+        except Exception as e:
+            logger.exception('Batch operation failed', extra={'op': op.get('op')})
+            results[i] = _error(str(e), 500)
+
+    for code, indices in groups.items():
+        try:
+            _run_group(actions, code, indices, ops, results)
+        except Exception as e:
+            logger.exception('Batch commit failed', extra={'code': code})
+            for i in indices:
+                results[i] = _error(str(e), 500)
+    return results
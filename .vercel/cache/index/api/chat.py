@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+
+# Messages returned by /get_messages when no limit is given, and the most allowed
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+# Messages kept per game; the oldest is overwritten once the buffer is full
+MESSAGE_CAPACITY = int(os.environ.get('KHELONA_CHAT_CAPACITY', 100))
+
+# Longest message accepted, in UTF-8 bytes
+MAX_MESSAGE_BYTES = int(os.environ.get('KHELONA_CHAT_MAX_BYTES', 200))
+
+
+def append_message(game, player_index, text):
+    """Add a chat message to the game's log and return it.
+
+    Messages live in the game record next to 'state', in a ring buffer of
+    compact [epoch seconds, player index, text] records. Message id n sits
+    in slot (n - 1) % capacity, so appending never shifts or grows past the
+    capacity fixed when the game's first message was sent. Ids start at 1
+    and go up by one, so they double as a read cursor.
+    """
+    capacity = game.setdefault('message_capacity', MESSAGE_CAPACITY)
+    message_id = game.get('next_message_id', 1)
+    record = [int(time.time()), player_index, sys.intern(text)]
+    slots = game.setdefault('messages', [])
+    if len(slots) < capacity:
+        slots.append(record)
+    else:
+        slots[(message_id - 1) % capacity] = record
+    game['next_message_id'] = message_id + 1
+    return expand_message(game, message_id, record)
+
+
+def expand_message(game, message_id, record):
+    """Turn a compact message record into the dict sent to clients"""
+    timestamp, player_index, text = record
+    return {
+        'id': message_id,
+        'player': game['state']['players'][player_index],
+        'player_index': player_index,
+        'message': text,
+        'timestamp': timestamp
+    }
+
+
+def last_message_id(game):
+    """Return the id of the newest message, or 0 if there are none"""
+    return game.get('next_message_id', 1) - 1
+
+
+def messages_after(game, after=0, limit=None):
+    """Return messages with ids greater than after, oldest first.
+
+    Messages already overwritten in the ring buffer are skipped.
+    """
+    slots = game.get('messages', [])
+    if not slots:
+        return []
+    capacity = game['message_capacity']
+    next_id = game['next_message_id']
+    first = max(after + 1, next_id - len(slots))
+    last = next_id if limit is None else min(next_id, first + limit)
+    return [expand_message(game, i, slots[(i - 1) % capacity]) for i in range(first, last)]
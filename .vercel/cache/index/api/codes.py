@@ -0,0 +1,94 @@
+"""Game codes from a keyed permutation of a counter.
+
+Game number n gets the code for feistel(n), where feistel is a keyed
+Feistel network over the 36**6 six-character codes. Codes look random,
+two numbers never share a code, and allocating one needs no lookup.
+
+With instance bits set, the code space is split into 2**bits equal ranges
+and each instance only hands out codes from its own range, so decode()
+tells which instance created a game without asking anyone.
+"""
+import hashlib
+import os
+
+ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+CODE_LENGTH = 6
+CODE_SPACE = len(ALPHABET) ** CODE_LENGTH
+
+FEISTEL_ROUNDS = 4
+
+
+class CodeAllocator:
+    """Maps game numbers 0, 1, 2, ... to distinct random-looking codes"""
+
+    def __init__(self, key, instance_bits=0, instance_id=0):
+        if not 0 <= instance_id < 1 << instance_bits:
+            raise ValueError(f'Instance id {instance_id} does not fit in {instance_bits} bits')
+        self.instance_id = instance_id
+        self.size = CODE_SPACE >> instance_bits  # codes available to each instance
+        self._half_bits = ((self.size - 1).bit_length() + 1) // 2
+        self._half_mask = (1 << self._half_bits) - 1
+        if isinstance(key, str):
+            key = key.encode()
+        self._round_keys = [hashlib.blake2b(key, digest_size=16, person=b'round%d' % r).digest()
+                            for r in range(FEISTEL_ROUNDS)]
+
+    def _round(self, r, half):
+        digest = hashlib.blake2b(half.to_bytes(4, 'big'), key=self._round_keys[r], digest_size=4).digest()
+        return int.from_bytes(digest, 'big') & self._half_mask
+
+    def _permute(self, n):
+        # The network permutes 2**(2 * half_bits) values; cycle walking repeats
+        # it until the result lands back below size (about twice on average)
+        while True:
+            left, right = n >> self._half_bits, n & self._half_mask
+            for r in range(FEISTEL_ROUNDS):
+                left, right = right, left ^ self._round(r, right)
+            n = left << self._half_bits | right
+            if n < self.size:
+                return n
+
+    def _unpermute(self, n):
+        while True:
+            left, right = n >> self._half_bits, n & self._half_mask
+            for r in reversed(range(FEISTEL_ROUNDS)):
+                left, right = right ^ self._round(r, left), left
+            n = left << self._half_bits | right
+            if n < self.size:
+                return n
+
+    def code(self, n):
+        """Return the code for game number n"""
+        if not 0 <= n < self.size:
+            raise ValueError('No game codes left for this instance')
+        value = self.instance_id * self.size + self._permute(n)
+        chars = []
+        for _ in range(CODE_LENGTH):
+            value, digit = divmod(value, len(ALPHABET))
+            chars.append(ALPHABET[digit])
+        return ''.join(reversed(chars))
+
+    def decode(self, code):
+        """Return (instance_id, game number) for a code, or None if it is malformed"""
+        if not isinstance(code, str) or len(code) != CODE_LENGTH:
+            return None
+        value = 0
+        for char in code:
+            digit = ALPHABET.find(char)
+            if digit < 0:
+                return None
+            value = value * len(ALPHABET) + digit
+        instance_id, n = divmod(value, self.size)
+        return instance_id, self._unpermute(n)
+
+
+def create_code_allocator(store):
+    """Create the code allocator configured by KHELONA_CODE_* environment variables.
+
+    Without KHELONA_CODE_KEY the key comes from the store, so every worker
+    sharing a sqlite store permutes the shared counter the same way.
+    """
+    key = os.environ.get('KHELONA_CODE_KEY') or store.shared_key('game_codes')
+    return CodeAllocator(key,
+                         int(os.environ.get('KHELONA_CODE_INSTANCE_BITS', 0)),
+                         int(os.environ.get('KHELONA_CODE_INSTANCE_ID', 0)))
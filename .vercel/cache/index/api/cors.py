@@ -0,0 +1,81 @@
+"""CORS as a WSGI layer with header sets computed once at startup.
+
+Every response gets a prebuilt list of CORS headers appended, and
+preflight OPTIONS requests are answered here with 204 and an
+Access-Control-Max-Age, so browsers cache the preflight instead of
+repeating it before every JSON POST. Nothing is parsed or formatted per
+request beyond looking up the Origin.
+"""
+import os
+import time
+
+# Seconds browsers may cache a preflight answer (Chrome caps this at 7200)
+DEFAULT_MAX_AGE = 86400
+
+DEFAULT_METHODS = ('GET', 'POST', 'PUT', 'DELETE', 'OPTIONS')
+DEFAULT_ALLOW_HEADERS = ('Content-Type', 'Authorization', 'If-None-Match')
+DEFAULT_EXPOSE_HEADERS = ('ETag',)
+
+
+class CorsMiddleware:
+    """WSGI middleware adding precomputed CORS headers and answering preflights.
+
+    origins is '*' or a list of allowed origins. With '*' the headers never
+    depend on the request; with a list, each allowed origin has its own
+    prebuilt set and other origins get no CORS headers.
+    on_request(route, method, status, seconds, timings) is called for each
+    preflight answered here, so they still reach metrics and the access log.
+    """
+
+    def __init__(self, app, origins='*', methods=DEFAULT_METHODS,
+                 allow_headers=DEFAULT_ALLOW_HEADERS, expose_headers=DEFAULT_EXPOSE_HEADERS,
+                 max_age=DEFAULT_MAX_AGE, on_request=None):
+        self.app = app
+        self.on_request = on_request
+        self.wildcard = origins == '*'
+        common = [('Access-Control-Expose-Headers', ', '.join(expose_headers)),
+                  ('Timing-Allow-Origin', '*')]
+        preflight = [('Access-Control-Allow-Methods', ', '.join(methods)),
+                     ('Access-Control-Allow-Headers', ', '.join(allow_headers)),
+                     ('Access-Control-Max-Age', str(max_age)),
+                     ('Content-Length', '0')]
+        if self.wildcard:
+            self._simple = {None: [('Access-Control-Allow-Origin', '*')] + common}
+        else:
+            self._simple = {origin: [('Access-Control-Allow-Origin', origin), ('Vary', 'Origin')] + common
+                            for origin in origins}
+        self._preflight = {origin: headers + preflight for origin, headers in self._simple.items()}
+
+    def _lookup(self, table, environ):
+        if self.wildcard:
+            return table[None]
+        return table.get(environ.get('HTTP_ORIGIN'))
+
+    def __call__(self, environ, start_response):
+        if environ.get('REQUEST_METHOD') == 'OPTIONS' and 'HTTP_ACCESS_CONTROL_REQUEST_METHOD' in environ:
+            start = time.perf_counter()
+            headers = self._lookup(self._preflight, environ)
+            if headers is not None:
+                start_response('204 NO CONTENT', list(headers))
+                if self.on_request is not None:
+                    self.on_request('preflight', 'OPTIONS', 204, time.perf_counter() - start, {})
+                return [b'']
+
+        cors_headers = self._lookup(self._simple, environ)
+        if cors_headers is None:
+            cors_headers = [('Vary', 'Origin')]  # an origin that is not allowed
+
+        def start_with_cors(status, headers, *exc_info):
+            headers.extend(cors_headers)
+            return start_response(status, headers, *exc_info)
+
+        return self.app(environ, start_with_cors)
+
+
+def create_cors(app, on_request=None):
+    """Wrap a WSGI app in CorsMiddleware configured by KHELONA_CORS_* environment variables"""
+    origins = os.environ.get('KHELONA_CORS_ORIGINS', '*')
+    if origins != '*':
+        origins = [origin.strip() for origin in origins.split(',') if origin.strip()]
+    max_age = int(os.environ.get('KHELONA_CORS_MAX_AGE', DEFAULT_MAX_AGE))
+    return CorsMiddleware(app, origins, max_age=max_age, on_request=on_request)
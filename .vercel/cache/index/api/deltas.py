@@ -0,0 +1,87 @@
+import copy
+
+from chat import last_message_id, messages_after
+from games import game_view
+
+# Versions of patches kept per game; clients further behind get a full snapshot
+CHANGE_LOG_SIZE = 32
+
+
+def diff_states(old, new):
+    """Return the patch that turns game state old into new.
+
+    Board cells become [index, value] pairs and any other field is
+    included only when its value changed.
+    """
+    patch = {}
+    for key, value in new.items():
+        if key == 'board':
+            old_board = old.get('board', [])
+            cells = [[i, cell] for i, cell in enumerate(value)
+                     if i >= len(old_board) or old_board[i] != cell]
+            if cells:
+                patch['cells'] = cells
+        elif old.get(key) != value:
+            patch[key] = copy.deepcopy(value)
+    return patch
+
+
+def snapshot(game):
+    """Capture what record_change needs to know about a game before a write"""
+    return {
+        'state': copy.deepcopy(game_view(game['type'], game['state'])),
+        'last_message_id': last_message_id(game)
+    }
+
+
+def record_change(game, before):
+    """Append the patch for the game's next write to its change log.
+
+    New chat messages are not copied into the patch: it only keeps the id
+    of the last message before the write, and delta_since reads the
+    messages from the ring buffer.
+    """
+    patch = diff_states(before['state'], game_view(game['type'], game['state']))
+    if last_message_id(game) != before['last_message_id']:
+        patch['messages_after'] = before['last_message_id']
+    changes = game.setdefault('changes', [])
+    changes.append([game['version'] + 1, patch])
+    del changes[:-CHANGE_LOG_SIZE]
+
+
+def merge_patches(patches):
+    """Combine consecutive patches into one"""
+    merged = {}
+    cells = {}
+    for patch in patches:
+        for key, value in patch.items():
+            if key == 'cells':
+                cells.update((i, cell) for i, cell in value)
+            elif key == 'messages_after':
+                merged.setdefault(key, value)  # the earliest patch with messages has the cursor
+            else:
+                merged[key] = value
+    if cells:
+        merged['cells'] = [[i, cells[i]] for i in sorted(cells)]
+    return merged
+
+
+def delta_since(game, since):
+    """Return the patch from version since to the game's current version.
+
+    Returns None when the change log no longer reaches back that far, in
+    which case the caller should send a full snapshot instead.
+    """
+    version = game['version']
+    if since == version:
+        return {}
+    changes = game.get('changes', [])
+    if since > version or not changes or changes[0][0] > since + 1:
+        return None
+    patch = merge_patches(patch for v, patch in changes if v > since)
+    if 'messages_after' in patch:
+        # Like /get_messages, messages the ring buffer has overwritten are skipped
+        messages = messages_after(game, patch.pop('messages_after'))
+        if messages:
+            patch['messages'] = messages
+    return patch
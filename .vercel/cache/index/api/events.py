@@ -0,0 +1,8 @@
+def state_event(entry):
+    """Frame a StateCache entry as a Server-Sent Event whose id is the game version.
+
+    The data line is the cached /game_state body, so a state change is
+    serialized once for pollers and every event stream subscriber alike.
+    """
+    version, body, _ = entry
+    return b'id: %d\nevent: state\ndata: %s\n\n' % (version, body.rstrip(b'\n'))
@@ -0,0 +1,94 @@
+"""Raw WSGI fast path for game state polls.
+
+Plain GET /game_state/<code> requests, with no query string, are most of
+the traffic. GameStateFastPath answers them from the encoded state cache
+(state_cache.py) with headers built ahead of time, skipping Flask's request context, routing,
+after-request hooks and jsonify. Anything else, including long polls and
+delta requests, goes on to the wrapped app unchanged.
+
+Responses match the Flask route byte for byte: the same JSON, ETag,
+Cache-Control and Server-Timing. CORS headers are added by the CORS layer
+around both (cors.py).
+"""
+import time
+
+from state_cache import accepts_gzip
+from timing import finish_request, server_timing_header, start_request, timed
+
+ROUTE = '/game_state/<code>'
+PREFIX = '/game_state/'
+
+_NOT_FOUND_BODY = b'{"error":"Game not found"}\n'
+
+
+def etag_matches(if_none_match, etag):
+    """Return True if an If-None-Match header value matches an unquoted ETag.
+
+    Like the Flask route, only strong tags (and '*') count as a match.
+    """
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag == '*' or tag == f'"{etag}"':
+            return True
+    return False
+
+
+class GameStateFastPath:
+    """WSGI middleware that serves plain game state polls without Flask.
+
+    Bodies come from the StateCache shared with the Flask route.
+    on_request(route, method, status, seconds, timings) is called after each
+    fast path response, so requests still reach metrics and the access log.
+    """
+
+    def __init__(self, app, games, state_cache, on_request=None):
+        self.app = app
+        self.games = games
+        self.state_cache = state_cache
+        self.on_request = on_request
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        code = path[len(PREFIX):]
+        if (environ.get('REQUEST_METHOD') != 'GET' or environ.get('QUERY_STRING')
+                or not path.startswith(PREFIX) or not code or '/' in code):
+            return self.app(environ, start_response)
+
+        # A poller that already has the version gets its 304 without the game
+        # ever being copied out of the store
+        start = time.perf_counter()
+        start_request()
+        try:
+            with timed('lookup'):
+                version = self.games.version(code)
+            modified = version is not None and not etag_matches(
+                environ.get('HTTP_IF_NONE_MATCH', ''), str(version))
+            entry = self.state_cache.get(code, version) if modified else None
+        finally:
+            timings = finish_request()
+
+        if entry is not None:
+            status = '200 OK'
+            version, body, gzipped = entry
+            use_gzip = gzipped is not None and accepts_gzip(environ.get('HTTP_ACCEPT_ENCODING', ''))
+            if use_gzip:
+                body = gzipped
+            headers = [('Content-Type', 'application/json'), ('Content-Length', str(len(body))),
+                       ('ETag', f'"{version}"'), ('Cache-Control', 'no-cache')]
+            if gzipped is not None:
+                headers.append(('Vary', 'Accept-Encoding'))
+            if use_gzip:
+                headers.append(('Content-Encoding', 'gzip'))
+        elif version is not None and not modified:
+            status, body = '304 NOT MODIFIED', b''
+            headers = [('ETag', f'"{version}"'), ('Cache-Control', 'no-cache')]
+        else:
+            status, body = '404 NOT FOUND', _NOT_FOUND_BODY
+            headers = [('Content-Type', 'application/json'), ('Content-Length', str(len(body)))]
+
+        seconds = time.perf_counter() - start
+        headers.append(('Server-Timing', server_timing_header(timings, seconds)))
+        start_response(status, headers)
+        if self.on_request is not None:
+            self.on_request(ROUTE, 'GET', int(status[:3]), seconds, timings)
+        return [body]
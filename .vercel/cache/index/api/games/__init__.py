@@ -1,10 +1,24 @@
 from .tic_tac_toe import create_tic_tac_toe_game, handle_tic_tac_toe_move
+from .tic_tac_toe_bitboard import create_bitboard_game, handle_bitboard_move, bitboard_view
+from .vs_computer import create_vs_computer_game, add_vs_computer_player, handle_vs_computer_move
 
 # Game registry - add new games here
 GAME_HANDLERS = {
     'tic-tac-toe': {
         'create': create_tic_tac_toe_game,
         'handle_move': handle_tic_tac_toe_move
+    },
+    # Same game on bitboards; 'view' turns its state into the list board clients expect
+    'tic-tac-toe-bitboard': {
+        'create': create_bitboard_game,
+        'handle_move': handle_bitboard_move,
+        'view': bitboard_view
+    },
+    # Single player against perfect play; 'add_player' seats the computer too
+    'vs-computer': {
+        'create': create_vs_computer_game,
+        'handle_move': handle_vs_computer_move,
+        'add_player': add_vs_computer_player
     }
 }
 
@@ -14,8 +28,23 @@ def create_game(game_type):
         return GAME_HANDLERS[game_type]['create']()
     return None
 
+def add_player(game_type, game_state, player):
+    """Seat a player, returning their index or None if the game is full"""
+    handler = GAME_HANDLERS.get(game_type, {}).get('add_player')
+    if handler:
+        return handler(game_state, player)
+    if len(game_state['players']) >= 2:
+        return None
+    game_state['players'].append(player)
+    return len(game_state['players']) - 1
+
 def handle_game_move(game_type, game_state, player_index, move_data):
     """Handle a move for the specified game type"""
     if game_type in GAME_HANDLERS:
         return GAME_HANDLERS[game_type]['handle_move'](game_state, player_index, move_data)
-    return False, game_state
\ No newline at end of file
+    return False, game_state
+
+def game_view(game_type, game_state):
+    """Return the game state as sent to clients"""
+    view = GAME_HANDLERS.get(game_type, {}).get('view')
+    return view(game_state) if view else game_state
\ No newline at end of file
@@ -1,3 +1,5 @@
+from .tic_tac_toe_table import lookup_winner
+
 def check_winner(board):
     """Check if there's a winner in Tic Tac Toe"""
     # Check rows, columns, and diagonals
@@ -30,14 +32,16 @@ def create_tic_tac_toe_game():
 
 def handle_tic_tac_toe_move(game, player_index, move_index):
     """Handle a move in Tic Tac Toe game"""
-    if game['game_over'] or game['board'][move_index] != '':
+    if game['game_over'] or not isinstance(move_index, int) or not 0 <= move_index < 9:
+        return False, game
+    if game['board'][move_index] != '':
         return False, game
     
     # Make the move
     game['board'][move_index] = 'X' if player_index == 0 else 'O'
     
-    # Check for winner
-    winner, winning_line = check_winner(game['board'])
+    # Check for winner (one lookup in the precomputed outcome table)
+    winner, winning_line = lookup_winner(game['board'])
     if winner:
         game['game_over'] = True
         game['winner'] = winner
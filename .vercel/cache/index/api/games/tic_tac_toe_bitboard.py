@@ -0,0 +1,81 @@
+"""Tic Tac Toe engine that keeps each player's marks as a 9-bit integer.
+
+Bit i of a player's marks is set when they hold cell i. A move is one OR,
+a win is an AND against the few line masks through the cell just played,
+and a tie is a single comparison with the full-board mask. The list board
+the API returns is only built by bitboard_view().
+"""
+
+# Cells of every line, and the same lines as bit masks
+LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),  # rows
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),  # columns
+    (0, 4, 8), (2, 4, 6)              # diagonals
+)
+WIN_MASKS = tuple(sum(1 << cell for cell in line) for line in LINES)
+LINE_CELLS = dict(zip(WIN_MASKS, (list(line) for line in LINES)))
+FULL_BOARD = 0b111111111
+
+# Masks of the lines through each cell, the only ones a move there can complete
+MASKS_BY_CELL = tuple(
+    tuple(mask for mask in WIN_MASKS if mask & (1 << cell)) for cell in range(9)
+)
+
+MARKS = ('X', 'O')
+
+
+def winning_mask(marks, cell):
+    """Return the line mask completed by playing cell, or 0"""
+    for mask in MASKS_BY_CELL[cell]:
+        if marks & mask == mask:
+            return mask
+    return 0
+
+
+def create_bitboard_game():
+    """Create a new bitboard Tic Tac Toe game state"""
+    return {
+        'players': [],
+        'marks': [0, 0],
+        'turn': 0,
+        'winner': None,
+        'game_over': False,
+        'winning_mask': 0
+    }
+
+
+def handle_bitboard_move(game, player_index, move_index):
+    """Handle a move in a bitboard Tic Tac Toe game"""
+    if game['game_over'] or not isinstance(move_index, int) or not 0 <= move_index < 9:
+        return False, game
+    bit = 1 << move_index
+    marks = game['marks']
+    if (marks[0] | marks[1]) & bit:
+        return False, game
+
+    marks[player_index] |= bit
+    mask = winning_mask(marks[player_index], move_index)
+    if mask:
+        game['game_over'] = True
+        game['winner'] = MARKS[player_index]
+        game['winning_mask'] = mask
+    elif marks[0] | marks[1] == FULL_BOARD:
+        game['game_over'] = True
+        game['winner'] = 'tie'
+    else:
+        game['turn'] = 1 - game['turn']
+
+    return True, game
+
+
+def bitboard_view(game):
+    """Return the state in the same shape as the list-based engine"""
+    x_marks, o_marks = game['marks']
+    return {
+        'players': game['players'],
+        'board': ['X' if x_marks >> i & 1 else 'O' if o_marks >> i & 1 else '' for i in range(9)],
+        'turn': game['turn'],
+        'winner': game['winner'],
+        'game_over': game['game_over'],
+        'winning_line': LINE_CELLS.get(game['winning_mask'], [])
+    }
@@ -0,0 +1,89 @@
+"""Solved Tic Tac Toe tables, generated by python -m games.tic_tac_toe_solver.
+
+zlib-compressed, base85-encoded best move table followed by the value table,
+3**9 bytes each; see tic_tac_toe_solver.py. Do not edit.
+"""
+TABLES = (
+    b'c-rk;S(Br<vKB&M9=p8txsL?l|Nj$pQEp0YpmMo;CgL0_%HyUaQ0}QOQ)8Sre%ybYpS&NP^Wppc)$jKQ@12?VuMU30_htX@e'
+    b'rNE;!kGQb{_pU29EGzkX4${a@H_9{FZ)lpGr=!BJzNufpZ5RAm^sXv=l%A62L~qa3gbLI+wbc!FeiNa<#K`d&HQ-F(|vN;@Q'
+    b'2xk)h_V67-Ya0Ddn*azPtTDCQJ+ThaW#L3p|+yj_^D3tP#GC<LD1A1C&~3lu?WlO5t70qUeg0!s7QK^X%~_5C$YKIDLtXl0U'
+    b'(dnZ8AMXn}`8+~F-dmCFeaQ+bW^2=ZE#0@$bk%L2sAFa{ntquSuwE+_8_YtsraE4td33y*U~$<zcHUqDI&tkcR^So2~?-uwe'
+    b'{k9r8>ZJfoFjy@&86B%Iuj<;6*<swoZft+z4$}$~2J`JU8yhwR6bQA1n660ZGQY&<E86%l+&kCK~amE3omZMpRSA$WDqLj5)'
+    b'n80^r)<uM}>$A<wVb=su8<45<Bg-q89ceGf7kTK2F3(osf}p(;x45rTUZlMv(WTVJFT6rKz<tdpHizIBMsW)4BuL66Qzh<G-'
+    b'e&%ABr)OQFW{dYI`d_^L`r*X*?`xY7Fhh~*;m`iM%O)s>2RBE+28}0K3h&4(GtfWUJI_xq4>riUy-2LDQj<(sU=1&dWFujuO'
+    b'3HBlGq<U4ipEEJoZA*F}$ik!6l(9@xAyL>+vUQZ*D6!M)mSA(cVKQYI$9>yoRU%9J@t(k5_o&1HLzF2tFP2jTkr_<{KWvN#?'
+    b'P`U=lawCG+gG&S!pp4?6?O@xZg;m{}z-!$1rqXEmeMEz6k4W%!OWF)mNx8D}0_(Y5q>?3pqUKT`t3OnBF0&n-q-q;!tS63{h'
+    b'zzN2RCqxM;I$Pz8w*U1tyisUtu<<1acUCbOH0|9O3%mD=3_Si~Z1IcTV^kzsS(Y!ESQKmR+#<3?Jd!B)+S&4i0W<Gad-fO2Y'
+    b'k{>&iGK{gy5<MHZ!JkMuGY6u5S=cq%xYT8Uo1;j1Q7TH&Y6-d=Muks5Ef5rzsq_N<E6f<>;JaHE|Ff&QjO<;@B1U~8lx0~Iq'
+    b'ZS{3c6r%EUJGq2G9Dsbz{BXiV#3*QUzl&G<h-^*l&MZ&#2l6p92b6~`i*|6C7cG==1=&(hY|<*CT0#s`Q8D@F;3F&DO&FSw='
+    b'#23whaE6;<DH&5~w$iNa^lWl`T`4j<%e{$|Sx^TqfG5uJ{!xCAlujBege=Ly<YeAeC<(k*>4Nqt}5fge_)5ns1ESc5HYuCby'
+    b'aLH<BgRER@%P`NpW^Wkmr768CVPaLQ7nxCeQaC;;m75}o;wPyc?hbgI!gHxhgU<JSyKp!gM}AHJVq4rZZTo$w9VFOQ4l*wYm'
+    b'KM#!-z&aq9oUp`IDc)vUh%IBQ!mz~bBmj!^JajxXpL34+gV^{LtJjWg+#~#meY>O;f2p*XMG$1`6(swDkh5_by+F;`SQy{1t'
+    b'b8wxQ!-2d^Sea#{X6}SpKAvMk25aMf*=funh*S2<4))7NcE#{6SL`^-{j&13Wxg?i-wyj_TkMw&@0Tmuo9>svODsOyFE_XWc'
+    b'!<^7JC3r#++!OITM``{asU_=;l7-%9=NZ<sD(^MD2>|7LQ#|sLNBqUY7Qw6o%Yy~hnB_dOdk&`@=9P9Ytq<6j=&~)NV391?K'
+    b'K&tKQxDhmP)Bw_kLN;VweRzHs-t&eC`SF0#5v|+j36V5~b`G$|x5JQXN3hxJY&g`n-T<FC9*A5tPPjMjg>L#C&7%Kh5v|2<N'
+    b'Np{m@GLFT}9{o+Sv5;8|DVy_2M2miO3@M$A*902z!q671uTw-q5`nTQo2B7I?pZv#k;nM_ix2ni=ZWE0}pv08D4iWC6yY}_f'
+    b'1Jtq#<!JFKtP!V2+ICBN%5nYTDD;(PkDk7P=euF|qE{t}K+F(hhR-)BR2%bAaML=E`C9hfJRl;JT08yq<+{~pzR791K=DZBo'
+    b'ye{x7OdR3+<#M<Ir!i`meHq~9`%*5mlnZi$-gTidyY|w%#&YqOI4kJ#C7Qzo<9>vS<SV3wxsSNZY#BqQy^0A3&LKC4%f-i^s'
+    b'=SzoCi2il9!7KE?92I!JCWDv3bQN)UwsL>eDV0XD<PmFmoa-XiQ6O#Zsgd!lL7@8r%_icCf-SrGmn<*C?HN4i4t1|%)tvPGO'
+    b'1-uoL5T-pd8z%JSzK?#4J{G3REOI^Nv^vPHoh_*Kt{{l$XfV;&W^g?Q}^!m9jA53>C?xoY2*inV0B6H83Y-I4v&+D|ZSN=_$'
+    b'iS-y114x_%n<InhItQu=*V<kDG&lY)qN>{$J8n;va=ZOj~Iy^DN5F3)NFQtz50mJ;)geDRYEo+qf&%*tcK%^!H|Jad?(IQ3^'
+    b'dcI933sXt7TC1Dh{lFX`qL&+=SAxwfI&K%n&=uT0FtH|pV$IcQMnm<DQiK<YbezQj<RJ8NrqXPWz`rq~6b!F9xB;Uw4S^FN5'
+    b'q7}q12ypy|tXffQ9#3sKiOV`vrTNA<P1U%Z^$kY!AhZs~ZDU-aP4bO_nQ*egZ1ZRmnCQD9ppuICMoU=c;j3wiwMDX&<XV_-<'
+    b'z={-ft2krGRBn&rw~YGICEA+HmQ7b{;<4~&0}7M>*Z>g#VHnrY!_2U$g!>D*!w?YpG=ZtPbtZ=K^RnyJ$B^SGygT+FAr&som'
+    b'MN5fdf3Jvs$70^zxDoBir>HJI{Mv6UXk$v8`9JSfNAwu2k+w*8q#pYR43nt2y?3mSYb|j_sVL>o~`@ReS@Xssb>XiyV9YZV7'
+    b'1^)U2+y)udXH)l*#A1O?`hS1TenY|UWDxAx0ZU3-&ig)OQT6W$=WZ&04R-nNR*89U&<#2k$K;kLrIJX@)~!ywLKD8QN_DVk('
+    b'%&@1h&m*IwH8SV(~tIBIUrpu)FeGTq2gYwsD329KYpZo2$?*%_LWzM{BzdW+<&GyUWpT%_><-p(BFIS!UX^^V<UZ>=hIrFTf'
+    b'o^g+7jSVRuB_XX6+X22&(cachw3CM}Eva{w;Sza`4QD>ovyM*9{9y?xYsa0VXM=V@DMC00MgN%MwiMeEKuYKe)JhOQR{hxAD'
+    b'<ajC;pb;7d}p778G)ja>4K9BPWOt$YK7_*8JY?J9>$KbXJAw{`t~vqNw#X&KX5<xkkXYO8Un)cA(ym=^Q~TyiUM?~O+{WYCB'
+    b'7uRB7d&Rc_?LDoUNGXXqYq)#IqICL9fVE2U;hrmDGAgCg~Ni#n}or2kCPlDd&9-4fOk<0uFSIsxxFvkA|6AuZS6dQC3CskN1'
+    b'iUR7-&d9w1z_H)al%UAFOUbGXogY}qT4>{XLqk@H%>8Pab2H<5PV*(>r1bGVQLxnNE4(ifzXSr^UTi7SEOb649-EPVe>TTWL'
+    b'vis%Dz7pk;f#F_W>id>{-2Ko$oI9_^}vFmNFhyJ`*B$@RQDE(8M=ir+tz~6`axF4IkuSamo<a=Fqm=}C69p+8?dyBIbhVzYZ'
+    b'wj%av<o(!F){kv#XDe*mV`p(0&sLmSN~F{y${FI6J3Y)h9P}*@{`>vdic#sIp_wVQOxGCmjYz3DF=j&Uv2|i*Q+ef?gYz?a?'
+    b'9R+#u!X$h3^`3Oq@|ytAG<S4sV1D~X6LfQyrjJ`E=N>kVpPOUB;^>F*&K?KK_0bNodW1PTfyd#$7M*C%ybr)Cmy45>?v;fOo'
+    b'{d!7F)?2RQhcOg%!MmisXzMGE{$5bdAcW8|Zg#4oXQ#dv(H@=%LjKXW{~Efr{kX`wgUB%%O5g!kJRqN;uE2_Sp(&Q)m9IvlW'
+    b')bG)6m>^D^SPqchKJx$i7Y?#%me5tsPh(Tvr@yu5jA9U3aC731jTC=F3@?6G5zih6hyq<C+hYj0;#(dJ<#_;#pGLd96o-r>N'
+    b'yhkrC#;$p{)z)0uWiewfCB0Qzey&E$&yUzbmj-9NKGYCF3G|RD9#^+BD4UPO9=qsJWVH`e^^KC}W9dUV9I^S2V_{(ZThim@X'
+    b'j*gSF70!R+Yz4zC6;yu`Fr|!89XkKUei^VhmsKmqu>u5j9vU(QzEReNs}=B^QA4a&Bp%y0fgs-}lx`lneywid8^*tjwD)WY{'
+    b'r|52UH{eB|NY1R$N%=P{qyDh>-F3}{O?!zQ@HP+uVBPa_}%vJFTeRUjDh<e?zsJ4xVFkH=hxrQ{o5L5@g1?=aNpb2hUYjK1A'
+    b'krjJK<kw-M{_sC;T@&=du5U>!I$f@afk_nCc($_?14_)XpQN<d$)T8?65Yzj1}|ecM+8V*>S0T;V;e;c>@dO}czzw`V-9dAr'
+    b'j>?Y{oIzXKD5QhL`4?}En%Zu`}(G;4+LYnUDQ4^Inxv&3-kZyu+;UL-F^lv21!d3X;`SpDmahpD_Q$!kSkz;goaclZr*!5@)'
+    b'nvcj`>?RVg5;q$)Jlg(;eAZ64;)WvoG{zUC1DNA_T;QO|}_r;p<M7eLk)vYRJqbT*onov3>@`vTVWl~<@jiSAG;o%B=z~|Wg'
+    b'`yFM;n(#omTP0<-Q>BMtg)eusLKyErbF9+CEk33;>yY;(cVQH){Cc}8N?Cj1T{j=^2sd}$TV%q9>$%}G!5nUWe;Vo`%Jj*0D'
+    b'%uOQZ@@#OEj(&PPVL0Om{l~BbBT();+PGeBXq62LeXb~25zD`h(~&eoiay7rtpd4R?5$bRL<+R@7?|Oi?lZ=?zTlr59~|)bM'
+    b'#1Tr^=6!Orz!Un9Ty+owh96i*mnp<zcTUQTh_!%XGcOPFZ`SOgCcGs#mxPT@Yp1_bQKM(iItz>Elk%K{>Bi6{JL?v}eQApY3'
+    b'!L?bR}EG3uCyTfxKAOjyY)^S%4i&?AYRM(sUb;o<API}79T@2AQ)o*-Y2%TM^k(1jj5m;jGK-?D*jtef_S5AjPNcf(Qpz+)S'
+    b'U%c%3{iGQ;m>UX*5ZB{jF+r-`<G=@AtBCjT0haUTtzKb)5_dPaxx9EGp(;D&E$-9t>tuhP!p<RQ=-e3%Q>??TeRcv{UJ__Zf'
+    b'Gl#o)o9(4+8OM+}-XfJsUY6uV_DRp#I6CgS4bL(bY{5{x33o7X5R=;S+At20rL5Z(WAmBE<_sjwDs_I?&Ky)+-oHo7eMibRi'
+    b'(f?hHTQ?8^BcWuO=p2O#i+;9S;ezyzwyorU79)AJ2K(=!(C2w8Eg8k^&XkfoE7yM?p)#f6&RpoT128ebFga{4{ecefV>VBAn'
+    b'G#*GBJmPcZp16Ks2msMq@<DKYpVvKY0I@*mAJ$hqC2pxf?~Imjgj4TUP!VrE?QI73&sT7D{Cd5{mIFw`KH5D&G+6Mq3WEI^r'
+    b'_!ztjp><&m~bdxg(JY0Mlpk#eqwN`lSJW2BTGVT1{aF4k413;pwLjoKS!x{)7Ck|jgA&C1@-at57b4mXuK*z?RmmMT$3<Q4C'
+    b'D{QZi~oX04Y=*TxX?%aZ%e(gV9z~7572iRXcNJSx!*!R(D*A}!o@O(SpFXJqy_9-|E?%Wf<VJRPzo$q`5<p;(o)3slIJ&97v'
+    b's3GR!3SYQFw!u}eu#Gt!(bdkeCBj+-1d*OU_+9u{qu#Z`EOJ@o#%}8ma_qM-hXZ+SRx*b*<RP|ug&)naMGv1MQ^p)%CwYfQZ'
+    b'6syE9J-{;`{l^7YQAyB{qnuoFO!tp+AHfpKSqBsC)@x#y>Ci;w}?3qrK#_|M$BQu^;?ZOlypUzwmr5QLwCp{t&!41d#^sFls'
+    b'xkOk1Kkyo8PX5IeeYyq3}>B?crfvUNLjP=WuKagna2OXC<&6YOkz{DE*;1I6{PAH*xc}cfb6IJB}2$InI0kmMsTg-9WM4Tj9'
+    b'YhmHWkC!%wqu8QnmT)w9-bHU@o;hle46GKUrPxibWO`XU@#RVx&Z{mjq<L8M<;tw`%BDUO|^#H%^pjc(-z0j(mfR@^CbP&@h'
+    b'u@5EQimTz8FG)nC)sxSso5w{(qBC>rW6@73n@e@=;`*}g6Bc<}L=v%UwVgwag?}Zmts0icOjNG!kih9bnSr8xQhYcU4qWL|O'
+    b'7e6PWBAC4gzs+ORevs`VsXHWIRN^V^0@T7zQ4w7=Q@O-3D&iVh<p)ubYbxa;?`3^1GlxHbik#*fA4ElLroHs8bIieNa}ZRdx'
+    b'(jfMhZ+^><6%=?=POLJ6nw}TDuPeGN=j_cP?2=6$G&$}x#$+_DH~!3>0U1jqggeuv}K#4A{K3#x6VfARL9i{vF<4M4phVyzE'
+    b'^pqDvAZ*7*lG*QA9L#tx0)R?`@(YGKO<eqoo|>6;TnEJ3psV#nVhMCp*MP<`1u_KWt@REYq?YDE>L3B2fXNWGimuv#1DFD>9'
+    b'FLf@8mqYHc5h%Z!*At^(hy80@`;&iw(8U1km$w)|m_UA3<>f4F8S@tSpXlr`U+hgTW=9glq#d7b0fsnauO`xNq85kFK4(Dv8'
+    b'|F6HoQqF6t>s>?WiS7p}GuI=+H{6p6Vh4P1Z_^}lpzUv)jYgQ{5`$}u0v`=wc+UH=kE$21g9$U`h@(SZ=S8-IWxN)`OnpZ1q'
+    b'4RbJhg_Zr+`3i01wbf64Cj|Ixj4<IS-{7_=r7GG#r^ymCYTKw*yGbQ0`a{k@ICI!^Gu|qJFiAKw-;4PMQ$o+-75<XJ(LZZ(n'
+    b'*{A4EJfuTatEII>+4s|A`3NtJ#~(q;MfZ9Wz0b`v^FlP_RChn4eycL`;-Jt&G*Z#YDJ3oUOTH5uD~3&EkWAXJm0utj@?As&v'
+    b'#N4&!#AiJ1NwM6{{O22CQJ&tK`^Mqn>F|?wDg=3n_n{<k)ftHGEUTJ<hRP=y#T5qXLMY%Sc-yfM+G7odZ{-v;#k^R4Z&&t<Y'
+    b'UMv}VwRjdxrY&4HzSFVKTq-+uX8m2zEsui~+<^=gG^g2sEl;tEsk4bM6D*b0}(>nZPg>}$p-^hm3zXs?p#npq0eK7OIczGmj'
+    b'I`?+6<_KKZ~wq$y^YCT+QZL94n3~O(jF4kwAOROeAzoVV15)#=vQ|f!#Ru5{U8{wHwb7TFMEhoM=!);Q)<gNX(jhwgL)e1qn'
+    b'wC~-byi&xhXp%31m#XizN&~C;p-^g+fJDkId_(Ni6nmz`w%#hKU%yjNX;lN|j_7luhw1b`SVC%_t$4lYyiDw(T&W-F;9b;@y'
+    b'>a(7oHSWue^jH#Z2Rfiic0aWas7T$pZN>vQl}&`v}e<ugnV8m>BYJ!y6U}-NB!8?eYB}A)0KNg<XwR-^{#ApW7o8Y^Q~Ty7w'
+    b'05Sb{?nt!wp~!40h#S5xZWyJH|iXE3#!c_9JG?WxJp~?iG0!XDi~#pcaZ{yl8^1n#tLUmi8W@-zU8yvD<m0UXks%5B8CrPr0'
+    b'7<is+8kR<8(-(YZ~Cx7is4yXx$#vdbp6@p^8Uk$j~&c0&(EraHo&>ft%kZi=1nVI=D86<NQ9LbZEE+P(Vii~Td{^X=c)E5d!'
+    b'SuAu9$_KMt6%;D>My&}o1e^svtcfH<_As<=c_b=6ty%Fxmn)#ADd_Kh$nM2v%tNO9ivlTaA^kZA;PTxH?j*;^PNk8^h#AU1Q'
+    b'q+Q&nars%$wV}V>eA!toRTz~ySVGJsb13MFRGfHh>|2iK0u1<Ap)}HUWAw7<;*MC{fyaLFSr`W#-c;#17I8K@pJKW^b}p|NM'
+    b'1U?1&{vsi-tEU`nQmpD`B93UNqLRh+c<@UsK{34hpHyE6=y4K&)JHr&(BtT9ck}zT&{SwuR78mb@d1p*?0`;p=1s}X+F6o=s'
+    b'{q@*RP89lCG{t=(p%Iaqd?{MMS2tTAH3*&<Ur;7}pXNF;RO9q}`t)?J;rW1SZp7Thtw@3Fj$}ec*dVd!tNy&Q`GREzedc?X^'
+    b'-H&Cgb_*XryduxsI?&TN_dv-Z7mxUW22RRpQzU28@c&x#(Yjfya(Q4b|ZwdoQ&jkA7un3p}$?yGHo=FpaxcqFmYIz(gsxnxQ'
+    b'9%SG4X@qYR7(QfBI0tD$CTm7FI{&J3eD;f3G8<(v@{eIf*{AsnZ4L|=^ufwwyE}ryUKXkUj7H2ECqSmUKeR{vVIl{FzrH6R-'
+    b'Bs({nbVzP|K1DO?OVOpfkGNm-*kfNaMsemKLMgR3i_4vdhB|p@`z_=EX*Y`U1aLn?+IwF6DFbPCalbX|ycg?lU7uay+jM=Fz'
+    b'5kx;U$Dae2V6N&aR'
+)
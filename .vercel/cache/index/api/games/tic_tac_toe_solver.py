@@ -0,0 +1,167 @@
+"""Solved Tic Tac Toe: game-theoretic values and perfect moves.
+
+The tables are solved offline and checked in as tic_tac_toe_solved.py, so
+no search runs in any request, cold instances included: first use only
+decompresses two 3**9-byte tables indexed by the base-3 board index.
+One holds the best move of every live position, the other its value.
+
+Values are from the point of view of the player to move: 1 win, 0 draw,
+-1 loss, together with the number of plies until the game ends.
+
+The solver that builds them is minimax with a transposition table keyed
+on the position's canonical form (the smallest base-3 index among its 8
+rotations and reflections), so the 5478 reachable positions collapse to
+765 solved entries. After changing it, regenerate the tables with
+
+    cd api && python -m games.tic_tac_toe_solver
+"""
+import base64
+import os
+import zlib
+from array import array
+
+from .tic_tac_toe_table import POWERS, REACHABLE, encode_board, outcome, outcome_table
+
+# Each symmetry maps cell i to cell SYMMETRIES[s][i]
+SYMMETRIES = tuple(
+    tuple(3 * r + c for r, c in (transform(i // 3, i % 3) for i in range(9)))
+    for transform in (
+        lambda r, c: (r, c),
+        lambda r, c: (c, 2 - r),
+        lambda r, c: (2 - r, 2 - c),
+        lambda r, c: (2 - c, r),
+        lambda r, c: (r, 2 - c),
+        lambda r, c: (2 - r, c),
+        lambda r, c: (c, r),
+        lambda r, c: (2 - c, 2 - r),
+    )
+)
+
+NO_MOVE = 255
+
+# Value table entry for positions that cannot come up in a legal game
+UNREACHABLE = 255
+
+RESULT_NAMES = {1: 'win', 0: 'draw', -1: 'loss'}
+
+_best_moves = None  # base-3 index -> best cell, NO_MOVE if the game is over
+_values = None      # base-3 index -> (value + 1) << 4 | distance, or UNREACHABLE
+
+
+def _canonical_form(index):
+    digits = [index // power % 3 for power in POWERS]
+    return min(
+        sum(digit * POWERS[symmetry[i]] for i, digit in enumerate(digits))
+        for symmetry in SYMMETRIES
+    )
+
+
+def _rank(result):
+    # Prefer higher values; win as fast as possible and lose as slowly as possible
+    value, distance = result
+    return value, -distance if value >= 0 else distance
+
+
+def _children(index):
+    """Yield (cell, child index) for every legal move in a live position"""
+    filled = sum(1 for power in POWERS if index // power % 3)
+    mark_code = 1 if filled % 2 == 0 else 2
+    for cell, power in enumerate(POWERS):
+        if index // power % 3 == 0:
+            yield cell, index + mark_code * power
+
+
+def _solve(index, canonical, values):
+    key = canonical[index]
+    result = values.get(key)
+    if result is not None:
+        return result
+
+    winner, _, game_over = outcome(index)
+    if game_over:
+        # A finished game was won by the player who just moved
+        result = (0, 0) if winner == 'tie' else (-1, 0)
+    else:
+        result = max(((-value, distance + 1)
+                      for value, distance in (_solve(child, canonical, values)
+                                              for _, child in _children(index))),
+                     key=_rank)
+    values[key] = result
+    return result
+
+
+def solve_tables():
+    """Solve every reachable position and return (best move table, value table)"""
+    table = outcome_table()
+    reachable = [index for index, entry in enumerate(table) if entry & REACHABLE]
+
+    canonical = array('H', bytes(2 * len(table)))
+    for index in reachable:
+        canonical[index] = _canonical_form(index)
+    solved = {}
+    _solve(0, canonical, solved)
+
+    values = bytearray([UNREACHABLE]) * len(table)
+    for index in reachable:
+        value, distance = solved[canonical[index]]
+        values[index] = (value + 1) << 4 | distance
+
+    best_moves = bytearray([NO_MOVE]) * len(table)
+    for index in reachable:
+        if not table[index] >> 4 & 0b11:
+            best_moves[index] = max(
+                _children(index),
+                key=lambda move: _rank(_child_result(values, move[1]))
+            )[0]
+    return bytes(best_moves), bytes(values)
+
+
+def _child_result(values, child):
+    entry = values[child]
+    return -((entry >> 4) - 1), (entry & 0b1111) + 1
+
+
+def _ensure_solved():
+    global _best_moves, _values
+    if _best_moves is None:
+        from .tic_tac_toe_solved import TABLES
+        tables = zlib.decompress(base64.b85decode(TABLES))
+        size = len(tables) // 2
+        _values = tables[size:]
+        # Published last: a non-None _best_moves means everything is ready
+        _best_moves = tables[:size]
+
+
+def move_values(board):
+    """Return {cell: (value, distance)} for every empty cell of a live list board.
+
+    Each value is for the player to move if they play that cell.
+    """
+    _ensure_solved()
+    index = encode_board(board)
+    if _best_moves[index] == NO_MOVE:
+        return {}
+    return {cell: _child_result(_values, child) for cell, child in _children(index)}
+
+
+def best_move(board):
+    """Return the cell perfect play chooses on a list board, or None if the game is over"""
+    _ensure_solved()
+    move = _best_moves[encode_board(board)]
+    return None if move == NO_MOVE else move
+
+
+def write_tables(path=os.path.join(os.path.dirname(__file__), 'tic_tac_toe_solved.py')):
+    """Solve the game and write the tables to the module the solver loads them from"""
+    best_moves, values = solve_tables()
+    encoded = base64.b85encode(zlib.compress(best_moves + values, 9)).decode()
+    lines = [encoded[i:i + 96] for i in range(0, len(encoded), 96)]
+    with open(path, 'w') as module:
+        module.write('"""Solved Tic Tac Toe tables, generated by python -m games.tic_tac_toe_solver.\n\n'
+                     'zlib-compressed, base85-encoded best move table followed by the value table,\n'
+                     '3**9 bytes each; see tic_tac_toe_solver.py. Do not edit.\n"""\n')
+        module.write('TABLES = (\n' + ''.join(f"    b'{line}'\n" for line in lines) + ')\n')
+
+
+if __name__ == '__main__':
+    write_tables()
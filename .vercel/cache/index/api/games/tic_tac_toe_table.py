@@ -0,0 +1,92 @@
+"""Precomputed outcomes for every reachable Tic Tac Toe board.
+
+A board is encoded in base 3, cell i contributing 0 (empty), 1 (X) or
+2 (O) times 3**i, and that number indexes a 3**9-byte table. Each byte
+holds the board's outcome:
+
+    bit 7     board is reachable in legal play
+    bits 4-5  winner: 0 none, 1 X, 2 O, 3 tie (the game is over unless 0)
+    bits 0-3  index of the winning line in LINES plus one, 0 if none
+
+The table is built on first use by walking every legal game from the
+empty board and running check_winner once per position, so lookups agree
+with check_winner exactly.
+"""
+
+LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),  # rows
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),  # columns
+    (0, 4, 8), (2, 4, 6)              # diagonals
+)
+LINE_INDEX = {line: i for i, line in enumerate(LINES)}
+
+POWERS = tuple(3 ** i for i in range(9))
+CELL_CODES = {'': 0, 'X': 1, 'O': 2}
+WINNERS = (None, 'X', 'O', 'tie')
+WINNER_CODES = {winner: code for code, winner in enumerate(WINNERS)}
+
+REACHABLE = 0x80
+
+_table = None
+
+
+def encode_board(board):
+    """Return the base-3 index of a list board"""
+    index = 0
+    for cell in reversed(board):
+        index = index * 3 + CELL_CODES[cell]
+    return index
+
+
+def _build_table():
+    from .tic_tac_toe import check_winner
+
+    table = bytearray(3 ** 9)
+    board = [''] * 9
+    stack = [(0, 0)]  # (index, number of marks on the board)
+    while stack:
+        index, filled = stack.pop()
+        if table[index]:
+            continue
+        for i in range(9):
+            board[i] = ('', 'X', 'O')[index // POWERS[i] % 3]
+        winner, line = check_winner(board)
+        line_code = LINE_INDEX[tuple(line)] + 1 if line else 0
+        table[index] = REACHABLE | WINNER_CODES[winner] << 4 | line_code
+        if winner:
+            continue
+        mark_code = 1 if filled % 2 == 0 else 2
+        for i in range(9):
+            if index // POWERS[i] % 3 == 0:
+                stack.append((index + mark_code * POWERS[i], filled + 1))
+    return table
+
+
+def outcome_table():
+    """Return the outcome table, building it on first use"""
+    global _table
+    if _table is None:
+        _table = _build_table()
+    return _table
+
+
+def outcome(index):
+    """Return (winner, winning_line, game_over) for an encoded board.
+
+    Returns None for boards that cannot come up in a legal game.
+    """
+    entry = outcome_table()[index]
+    if not entry & REACHABLE:
+        return None
+    winner = WINNERS[entry >> 4 & 0b11]
+    line_code = entry & 0b1111
+    return winner, list(LINES[line_code - 1]) if line_code else [], winner is not None
+
+
+def lookup_winner(board):
+    """Table-backed check_winner: return (winner, winning_line) for a list board"""
+    result = outcome(encode_board(board))
+    if result is None:
+        from .tic_tac_toe import check_winner
+        return check_winner(board)
+    return result[0], result[1]
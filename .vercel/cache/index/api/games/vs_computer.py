@@ -0,0 +1,25 @@
+from .tic_tac_toe import create_tic_tac_toe_game, handle_tic_tac_toe_move
+
+COMPUTER_NAME = 'Computer'
+
+
+def create_vs_computer_game():
+    """Create a Tic Tac Toe game against the computer"""
+    return create_tic_tac_toe_game()
+
+
+def add_vs_computer_player(game, player):
+    """Seat the human as X and the computer as O, returning the human's index"""
+    if game['players']:
+        return None
+    game['players'].extend([player, COMPUTER_NAME])
+    return 0
+
+
+def handle_vs_computer_move(game, player_index, move_index):
+    """Apply the human's move and answer with the computer's perfect reply"""
+    from .tic_tac_toe_solver import best_move
+    success, game = handle_tic_tac_toe_move(game, player_index, move_index)
+    if success and not game['game_over']:
+        handle_tic_tac_toe_move(game, 1, best_move(game['board']))
+    return success, game
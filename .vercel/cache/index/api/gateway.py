@@ -0,0 +1,148 @@
+"""Optional Socket.IO gateway for push clients such as client/src/App_socketio.js.
+
+Speaks the Engine.IO/Socket.IO protocol (WebSocket with long-polling
+fallback) on asyncio, so one process can hold thousands of idle sockets.
+Vercel functions cannot keep connections open, so the gateway runs as its
+own long-lived process:
+
+    pip install python-socketio uvicorn asgiref
+    KHELONA_STORE=sqlite uvicorn gateway:asgi_app --port 5001
+
+With asgiref installed the Flask routes are served from the same process.
+Use the sqlite store to share games with HTTP workers elsewhere.
+"""
+import asyncio
+
+try:
+    import socketio
+except ImportError:  # python-socketio is only needed for the gateway
+    socketio = None
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError:
+    WsgiToAsgi = None
+
+from actions import ActionError
+from games import game_view
+from index import app, game_actions, games
+
+# Seconds between checks for games changed by HTTP requests or other workers
+WATCH_INTERVAL = 0.5
+
+
+def create_gateway():
+    """Create the Socket.IO server with the game event handlers.
+
+    Game actions and store lookups block, on striped locks and with the
+    sqlite store on disk I/O, so handlers run them in worker threads and
+    the event loop keeps serving every other socket meanwhile.
+    """
+    if socketio is None:
+        raise RuntimeError('The Socket.IO gateway needs python-socketio installed')
+
+    sio = socketio.AsyncServer(async_mode='asgi', cors_allowed_origins='*')
+    rooms = {}  # game_code: {'version': last version sent to the room, 'sids': {...}}
+    watcher = []
+
+    async def broadcast_state(code, game):
+        # The watcher and the handlers can race; never send a room an older state
+        room = rooms.get(code)
+        if room is None or game['version'] <= room['version']:
+            return
+        room['version'] = game['version']
+        await sio.emit('update_board', game_view(game['type'], game['state']), room=code)
+
+    async def watch_rooms():
+        # Moves made over HTTP or by other workers never pass through the
+        # handlers below, so rooms are compared against the store regularly,
+        # with one lookup for every room's version
+        while True:
+            await asyncio.sleep(WATCH_INTERVAL)
+            if not rooms:
+                continue
+            versions = await asyncio.to_thread(games.versions, list(rooms))
+            for code, version in versions.items():
+                room = rooms.get(code)
+                if room is None or version <= room['version']:
+                    continue
+                game = await asyncio.to_thread(games.read, code)
+                if game is not None:
+                    await broadcast_state(code, game)
+
+    @sio.event
+    async def connect(sid, environ):
+        if not watcher:
+            watcher.append(sio.start_background_task(watch_rooms))
+
+    @sio.event
+    async def disconnect(sid, *args):
+        session = await sio.get_session(sid)
+        room = rooms.get(session.get('code'))
+        if room is not None:
+            room['sids'].discard(sid)
+            if not room['sids']:
+                del rooms[session['code']]
+
+    @sio.event
+    async def join_game(sid, data):
+        code = data.get('code')
+        player = data.get('player')
+        try:
+            game, player_index = await asyncio.to_thread(game_actions.join, code, player)
+        except ActionError as e:
+            await sio.emit('join_error', {'error': e.message}, to=sid)
+            return
+
+        await sio.save_session(sid, {'code': code, 'player': player})
+        await sio.enter_room(sid, code)
+        room = rooms.setdefault(code, {'version': 0, 'sids': set()})
+        room['sids'].add(sid)
+        room['version'] = max(room['version'], game['version'])
+
+        await sio.emit('player_joined', {'players': game['state']['players']}, room=code)
+        if len(game['state']['players']) == 2:
+            await sio.emit('start_game', game_view(game['type'], game['state']), room=code)
+
+    @sio.event
+    async def make_move(sid, data):
+        code = data.get('code')
+        try:
+            game = await asyncio.to_thread(game_actions.move, code, data.get('index'), data.get('player'))
+        except ActionError as e:
+            await sio.emit('move_error', {'error': e.message}, to=sid)
+            return
+        await broadcast_state(code, game)
+
+    @sio.event
+    async def chat_message(sid, data):
+        code = data.get('code')
+        try:
+            game, entry = await asyncio.to_thread(
+                game_actions.send_message, code, data.get('player'), data.get('message'))
+        except ActionError as e:
+            await sio.emit('chat_error', {'error': e.message}, to=sid)
+            return
+        room = rooms.get(code)
+        if room is not None:
+            # Only skip the state broadcast if the room already has everything
+            # before this message; otherwise the watcher still sends the state
+            if room['version'] == game['version'] - 1:
+                room['version'] = game['version']
+            await sio.emit('chat_message', entry, room=code)
+
+    return sio
+
+
+def create_asgi_app():
+    """Wrap the gateway in an ASGI app, with the Flask API behind it if possible"""
+    sio = create_gateway()
+    flask_app = WsgiToAsgi(app) if WsgiToAsgi is not None else None
+    return socketio.ASGIApp(sio, other_asgi_app=flask_app, socketio_path='socket.io')
+
+
+asgi_app = create_asgi_app() if socketio is not None else None
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(asgi_app, host='0.0.0.0', port=5001)
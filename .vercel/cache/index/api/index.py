@@ -1,20 +1,102 @@
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-import random
-import string
-from games import create_game, handle_game_move
+import logging
+import os
+import time
+from flask import Flask, Response, g, request, jsonify
+from games import GAME_HANDLERS, create_game, game_view
+from store import create_store
+from codes import create_code_allocator
+from waiters import GameWaiters
+from events import state_event
+from actions import ActionError, GameActions, VersionConflict
+from locks import StripedLocks
+from deltas import delta_since
+from chat import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, messages_after
+from logs import create_access_sampler, get_logger, setup_logging
+from metrics import RequestMetrics, render_metrics
+from fastpath import GameStateFastPath
+from state_cache import accepts_gzip, create_state_cache, encode_bulk_states
+from cors import create_cors
+from timing import (TimedJSONProvider, TimedRequest, finish_request, server_timing_header,
+                    start_request, timed)
+# Modules only some requests need (batch, the solver, sqlite3) are imported
+# where they are used, to keep cold starts short; see bench/startup.py
+
+setup_logging()
+logger = get_logger('index')
+# Busy routes keep only a sample of their access records, see logs.py
+access_sampler = create_access_sampler()
 
 app = Flask(__name__)
-# Configure CORS for backend API
-CORS(app, 
-     origins=["*"],  # Allow all origins for now, restrict in production
-     methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-     allow_headers=["Content-Type", "Authorization"])
+# JSON parsing and jsonify() report their time to the request's Server-Timing
+app.request_class = TimedRequest
+app.json = TimedJSONProvider(app)
+
+# Per-thread request counters and latency histograms, merged by /metrics
+request_metrics = RequestMetrics()
+
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+    start_request()
+
+@app.after_request
+def record_request(response):
+    seconds = time.perf_counter() - g.request_start
+    timings = finish_request()
+    response.headers['Server-Timing'] = server_timing_header(timings, seconds)
+
+    # Unmatched paths share one route label to keep metric cardinality bounded
+    rule = request.url_rule.rule if request.url_rule else 'unmatched'
+    observe_request(rule, request.method, response.status_code, seconds, timings)
+    return response
+
+def observe_request(rule, method, status, seconds, timings):
+    # Also called by the game state fast path and for preflights answered by
+    # the CORS layer, which both bypass the hooks above
+    request_metrics.observe(rule, method, status, seconds, timings)
+
+    # One access record per request, except on sampled routes; the sample is
+    # drawn first so dropped records cost nothing to build
+    if logger.isEnabledFor(logging.INFO) and access_sampler.keep(rule):
+        logger.info('request', extra={
+            'route': rule,
+            'method': method,
+            'status': status,
+            'duration_ms': round(seconds * 1000, 3),
+            'timings_ms': {phase: round(value * 1000, 3) for phase, value in timings.items()}
+        })
 
 # Remove SocketIO for serverless deployment - use HTTP polling instead
-# socketio = SocketIO(app, cors_allowed_origins="*", path='/api/socket.io', logger=True, engineio_logger=True)
+# Push clients can use the optional Socket.IO gateway in gateway.py
+
+# game_code: { 'type': 'tic-tac-toe', 'state': {...}, 'version': n }
+# Backend is chosen with KHELONA_STORE (memory or sqlite), see store.py
+games = create_store()
+
+# Long-poll requests on /game_state wait here until a write wakes them
+game_waiters = GameWaiters()
+
+# Codes are a keyed permutation of the store's game counter, see codes.py
+code_allocator = create_code_allocator(games)
+
+def generate_code():
+    return code_allocator.code(games.next_id())
+
+# Game writes, shared by the routes, /batch and the Socket.IO gateway (gateway.py)
+game_actions = GameActions(games, game_waiters, generate_code, StripedLocks())
+
+# Upper bound on ?wait= so a long poll finishes before the platform timeout
+MAX_WAIT_MS = 25000
 
-games = {}  # game_code: { 'type': 'tic-tac-toe', 'state': {...} }
+# Encoded /game_state bodies, one per game at its latest version;
+# KHELONA_STATE_GZIP=1 also keeps a gzipped copy, see state_cache.py
+state_cache = create_state_cache(games)
+
+# Seconds between keep-alive comments on an idle event stream
+SSE_HEARTBEAT_SECONDS = 15
+
+# Most games one /game_states request can ask for
+MAX_BULK_STATES = 100
 
 # Test route
 @app.route('/', methods=['GET'])
@@ -49,34 +131,36 @@ def test():
             'error': str(e)
         })
 
-def generate_code(length=6):
-    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=length))
+@app.route('/stats', methods=['GET'])
+def stats():
+    # Game counts and eviction counters from the game store
+    return jsonify(games.stats())
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    # Prometheus text exposition format
+    return Response(render_metrics(request_metrics, games),
+                    content_type='text/plain; version=0.0.4; charset=utf-8')
 
 @app.route('/create_game', methods=['POST'])
 def create_game_endpoint():
     try:
-        print("Creating game...")
-        code = generate_code()
-        while code in games:
-            code = generate_code()
-        
-        print(f"Generated code: {code}")
-        # Default to tic-tac-toe for now, can be extended to accept game type
+        # Any registered game type can be requested, anything else is tic-tac-toe
+        data = request.get_json(silent=True) or {}
+        game_type = data.get('game_type')
+        if game_type not in GAME_HANDLERS:
+            game_type = 'tic-tac-toe'
         try:
-            game_state = create_game('tic-tac-toe')
-            print(f"Game state created: {game_state}")
+            code = game_actions.create(game_type)
         except Exception as game_error:
-            print(f"Error creating game state: {game_error}")
+            logger.exception('Game creation failed', extra={'game_type': game_type})
             return jsonify({'error': f'Game creation failed: {str(game_error)}'}), 500
-            
-        games[code] = {'type': 'tic-tac-toe', 'state': game_state}
-        
-        print(f"Created game with code: {code}")
+
+        logger.info('Game created', extra={'code': code, 'game_type': game_type})
         return jsonify({'code': code})
     except Exception as e:
-        print(f"Error creating game: {e}")
+        logger.exception('Error creating game')
         import traceback
-        traceback.print_exc()
         return jsonify({'error': str(e), 'traceback': traceback.format_exc()}), 500
 
 # SocketIO handlers removed for serverless deployment
@@ -89,26 +173,211 @@ def join_game_http():
         data = request.get_json()
         code = data.get('code')
         player = data.get('player')
-        
-        if code not in games or len(games[code]['state']['players']) >= 2:
-            return jsonify({'error': 'Invalid or full game code'}), 400
-        
-        games[code]['state']['players'].append(player)
-        player_index = len(games[code]['state']['players']) - 1
-        
+
+        game, player_index = game_actions.join(code, player, data.get('expected_version'))
         return jsonify({
             'success': True,
             'player_index': player_index,
-            'players': games[code]['state']['players']
+            'players': game['state']['players']
         })
+    except VersionConflict as e:
+        return version_conflict(e)
+    except ActionError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
+        logger.exception('Join failed')
         return jsonify({'error': str(e)}), 500
 
+@app.route('/batch', methods=['POST'])
+def batch():
+    # Runs an ordered list of create/join/move/chat/state operations in one
+    # request, paying Flask dispatch, CORS and JSON parsing once per batch
+    from batch import MAX_BATCH_OPS, run_batch
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Invalid request'}), 400
+    ops = data.get('ops')
+    if not isinstance(ops, list):
+        return jsonify({'error': 'Invalid request'}), 400
+    if len(ops) > MAX_BATCH_OPS:
+        return jsonify({'error': f'At most {MAX_BATCH_OPS} operations per batch'}), 400
+    return jsonify({'results': run_batch(game_actions, ops, bool(data.get('atomic')))})
+
 @app.route('/game_state/<code>', methods=['GET'])
 def get_game_state(code):
-    if code in games:
-        return jsonify({'state': games[code]['state']})
-    return jsonify({'error': 'Game not found'}), 404
+    with timed('lookup'):
+        version = games.version(code)
+    if version is None:
+        return jsonify({'error': 'Game not found'}), 404
+
+    # Long poll: ?since=<version>&wait=<ms> holds the request until the game
+    # moves past that version, and answers 304 if nothing changed in time
+    since = request.args.get('since', type=int)
+    wait_ms = min(request.args.get('wait', 0, type=int), MAX_WAIT_MS)
+    if since is not None and version <= since and wait_ms > 0:
+        def changed():
+            current = games.version(code)
+            return current is None or current > since
+
+        if not game_waiters.wait(code, changed, wait_ms / 1000):
+            return state_not_modified(version)
+        version = games.version(code)
+        if version is None:
+            return jsonify({'error': 'Game not found'}), 404
+
+    # The version goes up on every join, move and chat message, so a poller
+    # that already has it gets an empty 304 instead of the full state
+    if request.if_none_match.contains(str(version)):
+        return state_not_modified(version)
+
+    # ?since=<version>&delta=1 asks for only what changed after that version,
+    # falling back to the full state if the change log doesn't reach back
+    if since is not None and request.args.get('delta'):
+        with timed('lookup'):
+            game = games.read(code)
+        if game is None:
+            return jsonify({'error': 'Game not found'}), 404
+        patch = delta_since(game, since)
+        if patch is not None:
+            response = jsonify({'delta': patch, 'since': since, 'version': game['version']})
+            return with_version_etag(response, game['version'])
+
+    entry = state_cache.get(code, version)
+    if entry is None:
+        return jsonify({'error': 'Game not found'}), 404
+    return cached_state_response(entry)
+
+@app.route('/game_states', methods=['GET', 'POST'])
+def get_game_states():
+    # GET ?codes=ABC123:4,DEF456 or POST {"codes": {"ABC123": 4, "DEF456": null}}
+    # where each code maps to the version the caller already has, if any
+    if request.method == 'POST':
+        data = request.get_json(silent=True)
+        codes = data.get('codes') if isinstance(data, dict) else None
+        if isinstance(codes, list):
+            if not all(isinstance(code, str) for code in codes):
+                return jsonify({'error': 'Invalid request'}), 400
+            codes = dict.fromkeys(codes)
+        if not isinstance(codes, dict):
+            return jsonify({'error': 'Invalid request'}), 400
+    else:
+        codes = {}
+        for item in request.args.get('codes', '').split(','):
+            code, _, seen = item.partition(':')
+            if code:
+                codes[code] = int(seen) if seen.isdigit() else None
+    if len(codes) > MAX_BULK_STATES:
+        return jsonify({'error': f'At most {MAX_BULK_STATES} games per request'}), 400
+
+    # Games still at the caller's version are only listed; the others reuse
+    # the bodies /game_state serves (state_cache.py) instead of re-encoding
+    with timed('lookup'):
+        versions = games.versions(codes)
+    states, unchanged, missing = {}, [], []
+    for code, seen in codes.items():
+        version = versions.get(code)
+        if version is not None and version == seen:
+            unchanged.append(code)
+            continue
+        entry = state_cache.get(code, version) if version is not None else None
+        if entry is None:
+            missing.append(code)
+            continue
+        states[code] = entry[1]
+    with timed('serialize'):
+        body = encode_bulk_states(states, unchanged, missing)
+    return app.response_class(body, mimetype='application/json')
+
+@app.route('/games/<code>/events', methods=['GET'])
+def game_events(code):
+    if games.version(code) is None:
+        return jsonify({'error': 'Game not found'}), 404
+
+    # Event ids are game versions, so a reconnecting EventSource resumes with
+    # Last-Event-ID and only gets a state event if it missed a change
+    last_seen = request.headers.get('Last-Event-ID', type=int)
+    if last_seen is None:
+        last_seen = request.args.get('last_event_id', 0, type=int)
+
+    def stream(last_seen):
+        yield b'retry: 3000\n\n'
+        while True:
+            def changed():
+                current = games.version(code)
+                return current is None or current > last_seen
+
+            if not game_waiters.wait(code, changed, SSE_HEARTBEAT_SECONDS):
+                yield b': heartbeat\n\n'
+                continue
+            # Subscribers share the state bytes /game_state serves, see state_cache.py
+            version = games.version(code)
+            entry = state_cache.get(code, version) if version is not None else None
+            if entry is None:
+                yield b'event: gone\ndata: {}\n\n'
+                return
+            last_seen = entry[0]
+            yield state_event(entry)
+
+    response = Response(stream(last_seen), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/analysis/<code>', methods=['GET'])
+def get_analysis(code):
+    game = games.read(code)
+    if game is None:
+        return jsonify({'error': 'Game not found'}), 404
+    state = game_view(game['type'], game['state'])
+    if 'board' not in state:
+        return jsonify({'error': 'Analysis is only available for Tic Tac Toe'}), 400
+
+    # Every value comes from the solved position table, nothing is searched here
+    from games.tic_tac_toe_solver import RESULT_NAMES, move_values
+    moves = []
+    if not state['game_over']:
+        for cell, (value, distance) in sorted(move_values(state['board']).items()):
+            moves.append({'cell': cell, 'result': RESULT_NAMES[value], 'distance': distance})
+    response = jsonify({
+        'turn': state['turn'],
+        'game_over': state['game_over'],
+        'moves': moves,
+        'version': game['version']
+    })
+    return with_version_etag(response, game['version'])
+
+def with_version_etag(response, version):
+    # no-cache makes browsers revalidate with If-None-Match on every poll
+    response.set_etag(str(version))
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def cached_state_response(entry):
+    # The body was encoded once for this version by state_cache, see state_cache.py
+    version, body, gzipped = entry
+    use_gzip = gzipped is not None and accepts_gzip(request.headers.get('Accept-Encoding', ''))
+    response = app.response_class(gzipped if use_gzip else body, mimetype='application/json')
+    with_version_etag(response, version)
+    if gzipped is not None:
+        response.headers['Vary'] = 'Accept-Encoding'
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+def state_not_modified(version):
+    return with_version_etag(app.response_class(status=304), version)
+
+def version_conflict(conflict):
+    # A client whose expected_version lost the race gets the current state
+    # with the 409, so it can redraw and retry without polling first
+    game = conflict.game
+    response = jsonify({
+        'error': conflict.message,
+        'state': game_view(game['type'], game['state']),
+        'version': game['version']
+    })
+    response.status_code = conflict.status
+    return with_version_etag(response, game['version'])
 
 @app.route('/make_move', methods=['POST'])
 def make_move_http():
@@ -117,31 +386,19 @@ def make_move_http():
         code = data.get('code')
         idx = data.get('index')
         player = data.get('player')
-        
-        if code not in games or idx is None or player not in games[code]['state']['players']:
-            return jsonify({'error': 'Invalid request'}), 400
-        
-        game_info = games[code]
-        game_state = game_info['state']
-        game_type = game_info['type']
-        
-        try:
-            player_index = game_state['players'].index(player)
-        except ValueError:
-            return jsonify({'error': 'Player not found'}), 400
-        
-        if game_state['turn'] != player_index or game_state['game_over']:
-            return jsonify({'error': 'Not your turn'}), 400
-        
-        success, updated_state = handle_game_move(game_type, game_state, player_index, idx)
-        
-        if success:
-            games[code]['state'] = updated_state
-            return jsonify({'success': True, 'state': updated_state})
-        else:
-            return jsonify({'error': 'Invalid move'}), 400
-            
+
+        game_info = game_actions.move(code, idx, player, data.get('expected_version'))
+        return jsonify({
+            'success': True,
+            'state': game_view(game_info['type'], game_info['state']),
+            'version': game_info['version']
+        })
+    except VersionConflict as e:
+        return version_conflict(e)
+    except ActionError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
+        logger.exception('Move failed')
         return jsonify({'error': str(e)}), 500
 
 @app.route('/send_message', methods=['POST'])
@@ -151,34 +408,43 @@ def send_message_http():
         code = data.get('code')
         player = data.get('player')
         message = data.get('message')
-        
-        if code not in games or player not in games[code]['state']['players']:
-            return jsonify({'error': 'Invalid request'}), 400
-        
-        # Add messages list to game state if it doesn't exist
-        if 'messages' not in games[code]['state']:
-            games[code]['state']['messages'] = []
-        
-        # Add the message with timestamp
-        import datetime
-        games[code]['state']['messages'].append({
-            'player': player,
-            'message': message,
-            'timestamp': datetime.datetime.now().strftime('%H:%M')
-        })
-        
+
+        game_actions.send_message(code, player, message)
         return jsonify({'success': True})
-        
+    except ActionError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
+        logger.exception('Sending message failed')
         return jsonify({'error': str(e)}), 500
 
 @app.route('/get_messages/<code>', methods=['GET'])
 def get_messages(code):
-    if code in games:
-        messages = games[code]['state'].get('messages', [])
-        return jsonify({'messages': messages})
+    # ?after=<id>&limit=<n> pages through the chat log; clients pass the
+    # last_id they were given to fetch only newer messages
+    after = request.args.get('after', 0, type=int)
+    limit = min(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), MAX_PAGE_SIZE)
+    game = games.read(code)
+    if game is not None:
+        messages = messages_after(game, after, limit + 1)
+        has_more = len(messages) > limit
+        messages = messages[:limit]
+        return jsonify({
+            'messages': messages,
+            'last_id': messages[-1]['id'] if messages else after,
+            'has_more': has_more
+        })
     return jsonify({'error': 'Game not found'}), 404
 
+# Plain GET /game_state/<code> polls are answered before Flask sees them;
+# KHELONA_FAST_STATE=0 sends them through the route above instead
+if os.environ.get('KHELONA_FAST_STATE', '1') == '1':
+    app.wsgi_app = GameStateFastPath(app.wsgi_app, games, state_cache, observe_request)
+
+# Configure CORS for backend API: prebuilt headers on every response, and
+# preflights answered with a long Access-Control-Max-Age, see cors.py.
+# All origins are allowed unless KHELONA_CORS_ORIGINS restricts them
+app.wsgi_app = create_cors(app.wsgi_app, observe_request)
+
 # For Vercel deployment - export the Flask app directly
 # Vercel will handle the WSGI interface automatically
 app = app
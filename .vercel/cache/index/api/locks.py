@@ -0,0 +1,22 @@
+import threading
+import zlib
+
+# Number of locks shared out between all games
+LOCK_STRIPES = 256
+
+
+class StripedLocks:
+    """A fixed array of locks, picked per game by a hash of its code.
+
+    Writes to one game always take the same lock, so concurrent joins and
+    moves in this process run one after the other instead of racing and
+    retrying their compare-and-set. Games on different stripes never
+    contend, and the lock count stays fixed however many games exist.
+    """
+
+    def __init__(self, stripes=LOCK_STRIPES):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def lock_for(self, code):
+        """Return the lock guarding writes to a game"""
+        return self._locks[zlib.crc32(str(code).encode()) % len(self._locks)]
@@ -0,0 +1,112 @@
+"""JSON logging for the backend.
+
+Records are written as one JSON object per line. By default they go
+through a queue to a listener thread, so a request never waits on stdout,
+and access records for busy routes are sampled down (DEFAULT_SAMPLE_RATES,
+overridden per route with KHELONA_LOG_SAMPLE). Only access records are
+sampled; warnings and errors are always written.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+
+# Fraction of access records kept per route unless KHELONA_LOG_SAMPLE says
+# otherwise; polls are most of the traffic and tell little one by one
+DEFAULT_SAMPLE_RATES = {'/game_state/<code>': 0.001, '/get_messages/<code>': 0.01}
+
+# Attributes every LogRecord has; anything else was passed in extra=
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record and its extra fields as one line of JSON"""
+
+    def format(self, record):
+        entry = {
+            'time': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class RouteSampler:
+    """Decides which access records to keep, before they are built.
+
+    rates maps a route rule such as '/game_state/<code>' to the fraction of
+    its records to keep. Routes without a rate are always kept.
+    """
+
+    def __init__(self, rates):
+        self.rates = rates
+
+    def keep(self, route):
+        rate = self.rates.get(route)
+        return rate is None or random.random() < rate
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    # The stock handler formats records on the calling thread; this one only
+    # resolves the message and traceback, leaving the JSON to the listener
+    def prepare(self, record):
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg, record.args, record.exc_info = record.message, None, None
+        return record
+
+
+def parse_sample_rates(spec):
+    """Parse '/route=rate,/other=rate' into {route: rate}"""
+    rates = {}
+    for item in spec.split(','):
+        route, _, rate = item.rpartition('=')
+        if route:
+            rates[route.strip()] = float(rate)
+    return rates
+
+
+def setup_logging():
+    """Configure the 'khelona' logger from KHELONA_LOG_* environment variables"""
+    logger = logging.getLogger('khelona')
+    if logger.handlers:
+        return logger
+    logger.setLevel(os.environ.get('KHELONA_LOG_LEVEL', 'INFO').upper())
+    logger.propagate = False
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter())
+    if os.environ.get('KHELONA_LOG_ASYNC', '1') == '1':
+        records = queue.SimpleQueue()
+        handler = _DeferredQueueHandler(records)
+        listener = logging.handlers.QueueListener(records, output)
+        listener.start()
+        atexit.register(listener.stop)
+    else:
+        handler = output
+    logger.addHandler(handler)
+    return logger
+
+
+def create_access_sampler():
+    """Create the RouteSampler for access records from KHELONA_LOG_SAMPLE and the defaults"""
+    rates = dict(DEFAULT_SAMPLE_RATES, **parse_sample_rates(os.environ.get('KHELONA_LOG_SAMPLE', '')))
+    return RouteSampler(rates)
+
+
+def get_logger(name):
+    """Return the backend logger for a module"""
+    return logging.getLogger(f'khelona.{name}')
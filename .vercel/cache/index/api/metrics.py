@@ -0,0 +1,160 @@
+"""Request metrics in the Prometheus text format.
+
+Each thread records into its own dicts, so a thread's requests never take
+a shared lock once it has registered; a scrape of /metrics merges every
+thread's numbers. Threads that have exited are folded into a retired
+total so their counts survive. That happens at scrape time, or when the
+registry has doubled since the last sweep, so servers that start a
+thread per request pay an O(1) registration, not a scan of every thread.
+"""
+import bisect
+import os
+import threading
+
+# Registered threads that trigger a sweep for exited ones between scrapes
+MIN_SWEEP_THREADS = 64
+
+# Upper bounds, in seconds, of the request latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _ThreadMetrics:
+    def __init__(self):
+        self.requests = {}   # (route, method, status): count
+        self.latencies = {}  # (route, status): [count per bucket..., +Inf count, sum]
+        self.phases = {}     # (route, phase): [count, sum]
+
+
+class RequestMetrics:
+    """Request counters, latency histograms and phase timings, recorded per thread"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._threads = {}  # Thread: its _ThreadMetrics
+        self._retired = _ThreadMetrics()
+        self._sweep_at = MIN_SWEEP_THREADS
+
+    def _mine(self):
+        mine = getattr(self._local, 'metrics', None)
+        if mine is None:
+            mine = self._local.metrics = _ThreadMetrics()
+            with self._lock:
+                self._threads[threading.current_thread()] = mine
+                # Bounds the registry if /metrics is never scraped
+                if len(self._threads) >= self._sweep_at:
+                    self._retire_dead_threads()
+        return mine
+
+    def _retire_dead_threads(self):
+        for thread in [thread for thread in self._threads if not thread.is_alive()]:
+            _merge(self._retired, self._threads.pop(thread))
+        self._sweep_at = max(MIN_SWEEP_THREADS, 2 * len(self._threads))
+
+    def observe(self, route, method, status, seconds, phases=None):
+        """Count one finished request, its latency and its {phase: seconds} timings"""
+        mine = self._mine()
+        key = (route, method, status)
+        mine.requests[key] = mine.requests.get(key, 0) + 1
+        histogram = mine.latencies.get((route, status))
+        if histogram is None:
+            histogram = mine.latencies[(route, status)] = [0] * (len(self.buckets) + 2)
+        histogram[bisect.bisect_left(self.buckets, seconds)] += 1
+        histogram[-1] += seconds
+        for phase, phase_seconds in (phases or {}).items():
+            totals = mine.phases.get((route, phase))
+            if totals is None:
+                totals = mine.phases[(route, phase)] = [0, 0.0]
+            totals[0] += 1
+            totals[1] += phase_seconds
+
+    def snapshot(self):
+        """Merge every thread's numbers into one _ThreadMetrics"""
+        total = _ThreadMetrics()
+        with self._lock:
+            self._retire_dead_threads()
+            _merge(total, self._retired)
+            for metrics in self._threads.values():
+                _merge(total, metrics)
+        return total
+
+
+def _merge(into, metrics):
+    # list() copies each dict in one step, so a thread writing meanwhile is safe
+    for key, count in list(metrics.requests.items()):
+        into.requests[key] = into.requests.get(key, 0) + count
+    for mine, theirs in ((into.latencies, metrics.latencies), (into.phases, metrics.phases)):
+        for key, values in list(theirs.items()):
+            merged = mine.setdefault(key, [0] * len(values))
+            for i, value in enumerate(list(values)):
+                merged[i] += value
+
+
+def resident_memory_bytes():
+    """Return the process's resident set size, or None where it can't be read"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _labels(**labels):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_metrics(request_metrics, store):
+    """Return the Prometheus exposition text for the requests and the game store"""
+    lines = []
+
+    def family(name, kind, help_text):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+
+    totals = request_metrics.snapshot()
+    family('khelona_requests_total', 'counter', 'HTTP requests handled.')
+    for (route, method, status), count in sorted(totals.requests.items()):
+        lines.append(f'khelona_requests_total{{{_labels(route=route, method=method, status=status)}}} {count}')
+
+    family('khelona_request_duration_seconds', 'histogram', 'HTTP request latency.')
+    bounds = [repr(bound) for bound in request_metrics.buckets] + ['+Inf']
+    for (route, status), histogram in sorted(totals.latencies.items()):
+        labels = _labels(route=route, status=status)
+        cumulative = 0
+        for bound, count in zip(bounds, histogram):
+            cumulative += count
+            lines.append(f'khelona_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'khelona_request_duration_seconds_sum{{{labels}}} {histogram[-1]}')
+        lines.append(f'khelona_request_duration_seconds_count{{{labels}}} {cumulative}')
+
+    family('khelona_request_phase_seconds', 'summary', 'Time spent per request phase, as in Server-Timing.')
+    for (route, phase), (count, seconds) in sorted(totals.phases.items()):
+        labels = _labels(route=route, phase=phase)
+        lines.append(f'khelona_request_phase_seconds_sum{{{labels}}} {seconds}')
+        lines.append(f'khelona_request_phase_seconds_count{{{labels}}} {count}')
+
+    games, chat_messages = store.census()
+    family('khelona_active_games', 'gauge', 'Games held by the store.')
+    for (game_type, phase), count in sorted(games.items()):
+        lines.append(f'khelona_active_games{{{_labels(type=game_type, phase=phase)}}} {count}')
+
+    family('khelona_chat_messages_stored', 'gauge', 'Chat messages held across all games.')
+    lines.append(f'khelona_chat_messages_stored {chat_messages}')
+
+    evictions = store.stats().get('evictions')
+    if evictions is not None:
+        family('khelona_evictions_total', 'counter', 'Games evicted from the store.')
+        for reason, count in sorted(evictions.items()):
+            lines.append(f'khelona_evictions_total{{{_labels(reason=reason)}}} {count}')
+
+    rss = resident_memory_bytes()
+    if rss is not None:
+        family('process_resident_memory_bytes', 'gauge', 'Resident memory size in bytes.')
+        lines.append(f'process_resident_memory_bytes {rss}')
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,99 @@
+"""Encoded /game_state bodies shared by every reader of a game version.
+
+Polls outnumber writes by far, and between two writes every poller of a
+game gets the same JSON. StateCache encodes it once per version (and,
+with KHELONA_STATE_GZIP=1, gzips it once too), so the cost of building a
+state response follows the write rate instead of the read rate. The
+Flask route, the fast path (fastpath.py) and the event streams
+(events.py) all serve from it.
+"""
+import gzip
+import json
+import os
+import threading
+
+from chat import last_message_id
+from games import game_view
+from timing import timed
+
+# Most games whose encoded state is kept; the least recently changed go first
+MAX_CACHED_STATES = 10000
+
+# zlib level for the precomputed gzip bodies, paid once per version
+GZIP_LEVEL = 6
+
+
+def encode_state(game):
+    """Encode a game's /game_state body exactly as jsonify() would"""
+    # Chat bumps the version too, so the body says whether new messages arrived
+    body = {'state': game_view(game['type'], game['state']), 'version': game['version'],
+            'last_message_id': last_message_id(game)}
+    return json.dumps(body, separators=(',', ':'), sort_keys=True).encode() + b'\n'
+
+
+def encode_bulk_states(bodies, unchanged, missing):
+    """Encode a /game_states response around cached bodies, exactly as jsonify() would"""
+    games = b','.join(json.dumps(code).encode() + b':' + bodies[code].rstrip(b'\n')
+                      for code in sorted(bodies))
+    return b'{"games":{%s},"missing":%s,"unchanged":%s}\n' % (
+        games, json.dumps(missing, separators=(',', ':')).encode(),
+        json.dumps(unchanged, separators=(',', ':')).encode())
+
+
+def accepts_gzip(accept_encoding):
+    """Return True if an Accept-Encoding header value allows gzip"""
+    for coding in accept_encoding.split(','):
+        name, _, params = coding.partition(';')
+        if name.strip().lower() in ('gzip', '*'):
+            return params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+
+class StateCache:
+    """Encoded /game_state response bodies, one per game, keyed by version.
+
+    gzip_level None means no gzipped copies. A read that hits the cache
+    never copies the game out of the store.
+    """
+
+    def __init__(self, store, gzip_level=None, max_entries=MAX_CACHED_STATES):
+        self.store = store
+        self.gzip_level = gzip_level
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = {}  # game_code: (version, body, gzipped body or None)
+
+    def get(self, code, version):
+        """Return (version, body, gzipped body or None) for a game at version, or None.
+
+        The entry may be for a newer version if the game changed meanwhile.
+        """
+        entry = self._entries.get(code)
+        if entry is not None and entry[0] == version:
+            return entry
+
+        with timed('lookup'):
+            game = self.store.read(code)
+        if game is None:
+            with self._lock:
+                self._entries.pop(code, None)
+            return None
+        with timed('serialize'):
+            body = encode_state(game)
+            gzipped = None
+            if self.gzip_level is not None:
+                gzipped = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+        entry = (game['version'], body, gzipped)
+
+        with self._lock:
+            self._entries.pop(code, None)
+            while len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._entries[code] = entry
+        return entry
+
+
+def create_state_cache(store):
+    """Create a StateCache configured by the KHELONA_STATE_GZIP environment variable"""
+    gzip_level = GZIP_LEVEL if os.environ.get('KHELONA_STATE_GZIP') == '1' else None
+    return StateCache(store, gzip_level)
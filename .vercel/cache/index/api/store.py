@@ -0,0 +1,461 @@
+import copy
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class GameStore:
+    """Interface for game storage backends.
+
+    A game record is a dict like {'type': 'tic-tac-toe', 'state': {...}}.
+    The store owns the record's 'version': it starts at 1 and goes up by one
+    on every successful write. Records returned by get() are private copies,
+    so callers can modify them and write them back: 'state' is copied in
+    full, and other lists in the record one level deep, so their items must
+    be replaced rather than changed in place. read() may return the stored
+    record itself, for callers that only look at it. A record passed to
+    put() or compare_and_set() belongs to the store afterwards.
+    """
+
+    def get(self, code):
+        """Return a copy of the game record, or None if there is no such game"""
+        raise NotImplementedError
+
+    def read(self, code):
+        """Return the game record for reading only, or None if there is no such game"""
+        return self.get(code)
+
+    def version(self, code):
+        """Return the current version of a game, or None if there is no such game"""
+        game = self.get(code)
+        return game['version'] if game is not None else None
+
+    def versions(self, codes):
+        """Return {code: current version} for those of codes that exist"""
+        versions = {code: self.version(code) for code in codes}
+        return {code: version for code, version in versions.items() if version is not None}
+
+    def put(self, code, game):
+        """Store a game record unconditionally and return its new version"""
+        raise NotImplementedError
+
+    def compare_and_set(self, code, expected_version, game):
+        """Store a game record only if it is still at expected_version.
+
+        An expected_version of None means the code must not exist yet.
+        Returns the new version, or None if another writer got there first.
+        """
+        raise NotImplementedError
+
+    def delete(self, code):
+        """Remove a game, returning True if it existed"""
+        raise NotImplementedError
+
+    def next_id(self):
+        """Return a number this store has never returned before, counting from 0"""
+        raise NotImplementedError
+
+    def shared_key(self, name):
+        """Return a random 16-byte key that every process using this store agrees on.
+
+        The key is created on first use.
+        """
+        raise NotImplementedError
+
+    def stats(self):
+        """Return counters describing the store"""
+        return {}
+
+    def census(self):
+        """Return ({(game type, phase): games}, chat messages stored) over every game"""
+        raise NotImplementedError
+
+    def __contains__(self, code):
+        return self.get(code) is not None
+
+
+def copy_record(game):
+    """Copy a game record as far as writers change it: all of 'state', other lists one level"""
+    record = dict(game)
+    for key, value in game.items():
+        if key == 'state':
+            record[key] = copy.deepcopy(value)
+        elif isinstance(value, list):
+            record[key] = list(value)
+    return record
+
+
+def game_phase(game):
+    """Return 'waiting', 'active' or 'finished' for a game record"""
+    state = game['state']
+    if state.get('game_over'):
+        return 'finished'
+    if len(state['players']) < 2:
+        return 'waiting'
+    return 'active'
+
+
+PHASES = ('waiting', 'active', 'finished')
+
+# Seconds a game may sit untouched in each phase before it is evicted
+DEFAULT_TTLS = {'waiting': 600, 'active': 3600, 'finished': 300}
+
+# Expired games removed per store call, so cleanup cost is spread over requests
+REAP_BUDGET = 4
+
+
+class MemoryGameStore(GameStore):
+    """Games kept in a dict in this process (the original behaviour).
+
+    The store is bounded: each game remembers when it was last read or
+    written, games untouched for longer than their phase's TTL are reaped,
+    and once max_games is reached the least recently touched game makes
+    room for a new one. Games are kept in one OrderedDict per phase in touch
+    order, so the oldest game of every phase is always at the front and each
+    call only has to look at those.
+    """
+
+    def __init__(self, max_games=10000, ttls=None):
+        self.max_games = max_games
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.evictions = {'lru': 0, 'waiting': 0, 'active': 0, 'finished': 0}
+        self._games = {}
+        self._phase = {}
+        self._touched = {phase: OrderedDict() for phase in PHASES}
+        self._next_id = 0
+        self._keys = {}
+        self._lock = threading.Lock()
+
+    def _touch(self, code, phase, now):
+        old_phase = self._phase.get(code)
+        if old_phase is not None and old_phase != phase:
+            del self._touched[old_phase][code]
+        self._phase[code] = phase
+        touched = self._touched[phase]
+        touched[code] = now
+        touched.move_to_end(code)
+
+    def _remove(self, code):
+        self._games.pop(code, None)
+        phase = self._phase.pop(code, None)
+        if phase is not None:
+            del self._touched[phase][code]
+
+    def _reap(self, now, budget):
+        """Evict up to budget expired games, oldest first"""
+        for phase in PHASES:
+            touched = self._touched[phase]
+            deadline = now - self.ttls[phase]
+            while budget and touched:
+                code, last_touched = next(iter(touched.items()))
+                if last_touched > deadline:
+                    break
+                self._remove(code)
+                self.evictions[phase] += 1
+                budget -= 1
+
+    def _evict_lru(self):
+        oldest = None
+        for touched in self._touched.values():
+            if touched:
+                code, last_touched = next(iter(touched.items()))
+                if oldest is None or last_touched < oldest[1]:
+                    oldest = (code, last_touched)
+        if oldest is not None:
+            self._remove(oldest[0])
+            self.evictions['lru'] += 1
+
+    def _store(self, code, game, now):
+        if code not in self._games:
+            while self._games and len(self._games) >= self.max_games:
+                self._evict_lru()
+        self._games[code] = game
+        self._touch(code, game_phase(game), now)
+
+    def get(self, code):
+        game = self.read(code)
+        return copy_record(game) if game is not None else None
+
+    def read(self, code):
+        # Stored records are never changed, only replaced, so they can be
+        # handed out and copied without holding the lock
+        now = time.monotonic()
+        with self._lock:
+            self._reap(now, REAP_BUDGET)
+            game = self._games.get(code)
+            if game is None:
+                return None
+            self._touch(code, self._phase[code], now)
+            return game
+
+    def version(self, code):
+        now = time.monotonic()
+        with self._lock:
+            self._reap(now, REAP_BUDGET)
+            game = self._games.get(code)
+            if game is None:
+                return None
+            self._touch(code, self._phase[code], now)
+            return game['version']
+
+    def versions(self, codes):
+        now = time.monotonic()
+        versions = {}
+        with self._lock:
+            self._reap(now, REAP_BUDGET)
+            for code in codes:
+                game = self._games.get(code)
+                if game is not None:
+                    self._touch(code, self._phase[code], now)
+                    versions[code] = game['version']
+        return versions
+
+    def put(self, code, game):
+        now = time.monotonic()
+        with self._lock:
+            self._reap(now, REAP_BUDGET)
+            current = self._games.get(code)
+            game['version'] = current['version'] + 1 if current else 1
+            self._store(code, game, now)
+            return game['version']
+
+    def compare_and_set(self, code, expected_version, game):
+        now = time.monotonic()
+        with self._lock:
+            self._reap(now, REAP_BUDGET)
+            current = self._games.get(code)
+            current_version = current['version'] if current else None
+            if current_version != expected_version:
+                return None
+            game['version'] = (expected_version or 0) + 1
+            self._store(code, game, now)
+            return game['version']
+
+    def delete(self, code):
+        with self._lock:
+            existed = code in self._games
+            self._remove(code)
+            return existed
+
+    def next_id(self):
+        with self._lock:
+            self._next_id += 1
+            return self._next_id - 1
+
+    def shared_key(self, name):
+        with self._lock:
+            return self._keys.setdefault(name, os.urandom(16))
+
+    def reap(self):
+        """Evict every expired game now"""
+        with self._lock:
+            self._reap(time.monotonic(), len(self._games))
+
+    def start_reaper(self, interval):
+        """Sweep expired games from a daemon thread every interval seconds"""
+        def run():
+            while True:
+                time.sleep(interval)
+                self.reap()
+
+        thread = threading.Thread(target=run, name='game-reaper', daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self):
+        with self._lock:
+            return {
+                'games': len(self._games),
+                'phases': {phase: len(self._touched[phase]) for phase in PHASES},
+                'max_games': self.max_games,
+                'evictions': dict(self.evictions)
+            }
+
+    def census(self):
+        games, chat_messages = {}, 0
+        with self._lock:
+            for code, game in self._games.items():
+                key = (game['type'], self._phase[code])
+                games[key] = games.get(key, 0) + 1
+                chat_messages += len(game.get('messages', ()))
+        return games, chat_messages
+
+    def __contains__(self, code):
+        return code in self._games
+
+    def __len__(self):
+        return len(self._games)
+
+
+# Most codes bound in one SQLite query (older builds allow at most 999)
+SQLITE_MAX_PARAMS = 500
+
+
+class SqliteGameStore(GameStore):
+    """Games kept in a SQLite database that several workers can share.
+
+    The database runs in WAL mode so pollers never block writers, and each
+    thread keeps its own connection open for reuse across requests.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS games ('
+            'code TEXT PRIMARY KEY, '
+            'data TEXT NOT NULL, '
+            'version INTEGER NOT NULL)'
+        )
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS counters ('
+            'name TEXT PRIMARY KEY, '
+            'value INTEGER NOT NULL)'
+        )
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS keys ('
+            'name TEXT PRIMARY KEY, '
+            'value BLOB NOT NULL)'
+        )
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            import sqlite3  # only the sqlite backend needs it, so it stays off cold start
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _encode(game):
+        return json.dumps({k: v for k, v in game.items() if k != 'version'},
+                          separators=(',', ':'))
+
+    def get(self, code):
+        row = self._connection().execute(
+            'SELECT data, version FROM games WHERE code = ?', (code,)
+        ).fetchone()
+        if row is None:
+            return None
+        game = json.loads(row[0])
+        game['version'] = row[1]
+        return game
+
+    def version(self, code):
+        row = self._connection().execute(
+            'SELECT version FROM games WHERE code = ?', (code,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def versions(self, codes):
+        codes = list(codes)
+        versions = {}
+        # Chunked to stay under SQLite's limit on bound parameters
+        for start in range(0, len(codes), SQLITE_MAX_PARAMS):
+            chunk = codes[start:start + SQLITE_MAX_PARAMS]
+            rows = self._connection().execute(
+                f'SELECT code, version FROM games WHERE code IN ({",".join("?" * len(chunk))})', chunk
+            ).fetchall()
+            versions.update(rows)
+        return versions
+
+    def put(self, code, game):
+        conn = self._connection()
+        data = self._encode(game)
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT version FROM games WHERE code = ?', (code,)
+            ).fetchone()
+            version = row[0] + 1 if row else 1
+            conn.execute(
+                'INSERT OR REPLACE INTO games (code, data, version) VALUES (?, ?, ?)',
+                (code, data, version)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        game['version'] = version
+        return version
+
+    def compare_and_set(self, code, expected_version, game):
+        conn = self._connection()
+        data = self._encode(game)
+        if expected_version is None:
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO games (code, data, version) VALUES (?, ?, 1)',
+                (code, data)
+            )
+        else:
+            cursor = conn.execute(
+                'UPDATE games SET data = ?, version = version + 1 '
+                'WHERE code = ? AND version = ?',
+                (data, code, expected_version)
+            )
+        if cursor.rowcount != 1:
+            return None
+        game['version'] = (expected_version or 0) + 1
+        return game['version']
+
+    def delete(self, code):
+        cursor = self._connection().execute('DELETE FROM games WHERE code = ?', (code,))
+        return cursor.rowcount == 1
+
+    def next_id(self):
+        # One atomic upsert, so workers sharing the database never get the same id
+        return self._connection().execute(
+            "INSERT INTO counters (name, value) VALUES ('game_id', 0) "
+            'ON CONFLICT (name) DO UPDATE SET value = value + 1 RETURNING value'
+        ).fetchone()[0]
+
+    def shared_key(self, name):
+        # The first worker to ask stores its key; everyone then reads the same row
+        conn = self._connection()
+        conn.execute('INSERT OR IGNORE INTO keys (name, value) VALUES (?, ?)', (name, os.urandom(16)))
+        return conn.execute('SELECT value FROM keys WHERE name = ?', (name,)).fetchone()[0]
+
+    def stats(self):
+        count = self._connection().execute('SELECT COUNT(*) FROM games').fetchone()[0]
+        return {'games': count}
+
+    def census(self):
+        # Mirrors game_phase() in SQL so the scan never decodes a game
+        rows = self._connection().execute(
+            "SELECT json_extract(data, '$.type'), "
+            "CASE WHEN json_extract(data, '$.state.game_over') THEN 'finished' "
+            "WHEN json_array_length(data, '$.state.players') < 2 THEN 'waiting' "
+            "ELSE 'active' END, "
+            "COUNT(*), TOTAL(json_array_length(data, '$.messages')) "
+            'FROM games GROUP BY 1, 2'
+        ).fetchall()
+        return ({(game_type, phase): count for game_type, phase, count, _ in rows},
+                int(sum(row[3] for row in rows)))
+
+    def __contains__(self, code):
+        return self._connection().execute(
+            'SELECT 1 FROM games WHERE code = ?', (code,)
+        ).fetchone() is not None
+
+
+def create_store():
+    """Create the game store selected by the KHELONA_STORE environment variable"""
+    backend = os.environ.get('KHELONA_STORE', 'memory')
+    if backend == 'sqlite':
+        import tempfile
+        path = os.environ.get('KHELONA_SQLITE_PATH',
+                              os.path.join(tempfile.gettempdir(), 'khelona.db'))
+        return SqliteGameStore(path)
+    if backend == 'memory':
+        ttls = {phase: float(os.environ[f'KHELONA_TTL_{phase.upper()}'])
+                for phase in PHASES if f'KHELONA_TTL_{phase.upper()}' in os.environ}
+        store = MemoryGameStore(int(os.environ.get('KHELONA_MAX_GAMES', 10000)), ttls)
+        reap_interval = float(os.environ.get('KHELONA_REAP_INTERVAL', 0))
+        if reap_interval > 0:
+            store.start_reaper(reap_interval)
+        return store
+    raise ValueError(f'Unknown game store: {backend}')
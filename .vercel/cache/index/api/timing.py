@@ -0,0 +1,69 @@
+"""Per-phase timing of a request, reported in the Server-Timing header.
+
+index.py starts a timing record for every request; code on the request
+path wraps its work in timed('phase') and the durations add up per phase.
+Outside a request (the Socket.IO gateway, scripts) timed() does nothing.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask import Request
+from flask.json.provider import DefaultJSONProvider
+
+_timings = ContextVar('khelona_timings', default=None)
+
+
+def start_request():
+    """Begin collecting phase timings for the current request"""
+    _timings.set({})
+
+
+def finish_request():
+    """Stop collecting and return {phase: seconds} for the current request"""
+    timings = _timings.get()
+    _timings.set(None)
+    return timings or {}
+
+
+def add_timing(phase, seconds):
+    """Add seconds to a phase of the current request, if one is being timed"""
+    timings = _timings.get()
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+
+@contextmanager
+def timed(phase):
+    """Time the enclosed block as part of a phase of the current request"""
+    if _timings.get() is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_timing(phase, time.perf_counter() - start)
+
+
+def server_timing_header(timings, total):
+    """Format phase timings and the total, in seconds, as a Server-Timing value"""
+    metrics = [f'{phase};dur={seconds * 1000:.3f}' for phase, seconds in timings.items()]
+    metrics.append(f'total;dur={total * 1000:.3f}')
+    return ', '.join(metrics)
+
+
+class TimedRequest(Request):
+    """Request whose JSON body parsing counts as the 'parse' phase"""
+
+    def get_json(self, *args, **kwargs):
+        with timed('parse'):
+            return super().get_json(*args, **kwargs)
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider whose jsonify() responses count as the 'serialize' phase"""
+
+    def response(self, *args, **kwargs):
+        with timed('serialize'):
+            return super().response(*args, **kwargs)
@@ -0,0 +1,49 @@
+import threading
+import time
+
+
+class GameWaiters:
+    """Per-game condition variables for requests waiting on a game to change.
+
+    A condition only exists while someone is waiting on that game, so idle
+    games cost nothing. Writers call notify() after a successful write.
+    """
+
+    def __init__(self, recheck_interval=1.0):
+        # Waiters also wake up this often to re-check, which catches writes
+        # made by other workers that cannot notify this process
+        self.recheck_interval = recheck_interval
+        self._lock = threading.Lock()
+        self._conditions = {}  # game_code: [Condition, number of waiters]
+
+    def notify(self, code):
+        """Wake every request waiting on this game"""
+        entry = self._conditions.get(code)
+        if entry is not None:
+            with entry[0]:
+                entry[0].notify_all()
+
+    def wait(self, code, is_ready, timeout):
+        """Block until is_ready() returns true or timeout seconds pass.
+
+        Returns the last value of is_ready().
+        """
+        with self._lock:
+            entry = self._conditions.setdefault(code, [threading.Condition(), 0])
+            entry[1] += 1
+        try:
+            deadline = time.monotonic() + timeout
+            with entry[0]:
+                ready = is_ready()
+                while not ready:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    entry[0].wait(min(remaining, self.recheck_interval))
+                    ready = is_ready()
+                return ready
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._conditions[code]
@@ -0,0 +1,77 @@
+"""Requests per second for GET /game_state/<code> with and without the fast path.
+
+Calls the WSGI app in process, so the numbers are framework overhead only,
+with no network or server in the way. Each scenario runs through Flask
+(the route in api/index.py) and through GameStateFastPath in front of it,
+at the default log level (INFO, with sampled access records) and at
+WARNING (no access records). Log output is discarded.
+
+    python bench/fast_state.py [--requests 20000]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, '.vercel', 'python', 'py3', 'api', '_vendor'),
+                os.path.join(ROOT, 'api')]
+os.environ['KHELONA_FAST_STATE'] = '1'
+
+from werkzeug.test import EnvironBuilder  # noqa: E402
+
+# The log handler keeps the stream it is created with, so records written
+# while index is imported and afterwards go to /dev/null
+sys.stdout = open(os.devnull, 'w')
+import index  # noqa: E402
+from cors import create_cors  # noqa: E402
+sys.stdout = sys.__stdout__
+
+LOG_LEVELS = ('INFO', 'WARNING')
+
+
+def requests_per_second(wsgi_app, environ, count):
+    def start_response(status, headers, exc_info=None):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(count):
+        for _chunk in wsgi_app(dict(environ), start_response):
+            pass
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args()
+
+    client = index.app.test_client()
+    code = client.post('/create_game').get_json()['code']
+    for player in ('Player1', 'Player2'):
+        client.post('/join_game', json={'code': code, 'player': player})
+    client.post('/make_move', json={'code': code, 'index': 4, 'player': 'Player1'})
+    version = index.games.version(code)
+
+    # index.app.wsgi_app is the CORS layer around the fast path around Flask
+    fast = index.app.wsgi_app
+    flask_only = create_cors(fast.app.app)
+    scenarios = {
+        '200 full state': {},
+        '304 not modified': {'If-None-Match': f'"{version}"'},
+    }
+    print(f'{"scenario":<20} {"log level":<9} {"flask req/s":>12} {"fast req/s":>12} {"speedup":>8}')
+    for name, headers in scenarios.items():
+        headers = dict(headers, Origin='https://khelona.example')
+        environ = EnvironBuilder(path=f'/game_state/{code}', headers=headers).get_environ()
+        for level in LOG_LEVELS:
+            logging.getLogger('khelona').setLevel(level)
+            requests_per_second(fast, environ, 200)  # warm up
+            slow_rate = requests_per_second(flask_only, environ, args.requests)
+            fast_rate = requests_per_second(fast, environ, args.requests)
+            print(f'{name:<20} {level:<9} {slow_rate:12.0f} {fast_rate:12.0f} '
+                  f'{fast_rate / slow_rate:7.1f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Cold start benchmark for api/index.py.
+
+Starts fresh interpreters that import the app and serve their first
+requests, and reports the median import time and time to first response
+(from just before the import until /create_game and /game_state have
+both answered). Exits with status 1 if either median is over budget.
+
+    python bench/startup.py [--runs 5] [--import-budget-ms 300]
+                            [--first-response-budget-ms 400] [--graph 15]
+
+--graph also prints the slowest imports, by cumulative time, from
+python -X importtime.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(ROOT, 'api')
+VENDOR_DIR = os.path.join(ROOT, '.vercel', 'python', 'py3', 'api', '_vendor')
+
+# Defaults for the budgets, in milliseconds
+IMPORT_BUDGET_MS = 300
+FIRST_RESPONSE_BUDGET_MS = 400
+
+CHILD = '''
+import json, time
+start = time.perf_counter()
+import index
+imported = time.perf_counter()
+client = index.app.test_client()
+code = client.post('/create_game').get_json()['code']
+assert client.get('/game_state/' + code).status_code == 200
+answered = time.perf_counter()
+print(json.dumps({'import_ms': (imported - start) * 1000, 'first_response_ms': (answered - start) * 1000}))
+'''
+
+
+def child_env():
+    env = dict(os.environ, KHELONA_LOG_LEVEL='WARNING')
+    paths = [VENDOR_DIR] if os.path.isdir(VENDOR_DIR) else []
+    env['PYTHONPATH'] = os.pathsep.join(paths + [API_DIR, env.get('PYTHONPATH', '')])
+    return env
+
+
+def measure(runs):
+    """Return [{'import_ms', 'first_response_ms'}] for each fresh interpreter"""
+    results = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', CHILD], env=child_env(), cwd=API_DIR,
+                                capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+
+def import_graph(limit):
+    """Return the limit slowest imports as (cumulative ms, self ms, module)"""
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import index'],
+                            env=child_env(), cwd=API_DIR, capture_output=True, text=True,
+                            check=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us) / 1000, int(self_us) / 1000, module.rstrip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--import-budget-ms', type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument('--first-response-budget-ms', type=float, default=FIRST_RESPONSE_BUDGET_MS)
+    parser.add_argument('--graph', type=int, default=0, metavar='N',
+                        help='print the N slowest imports')
+    args = parser.parse_args()
+
+    if args.graph:
+        print(f'{"cumulative ms":>14} {"self ms":>8}  module')
+        for cumulative, own, module in import_graph(args.graph):
+            print(f'{cumulative:14.1f} {own:8.1f}  {module}')
+        print()
+
+    results = measure(args.runs)
+    failed = False
+    for key, budget in (('import_ms', args.import_budget_ms),
+                        ('first_response_ms', args.first_response_budget_ms)):
+        median = statistics.median(result[key] for result in results)
+        over = median > budget
+        failed = failed or over
+        print(f'{key}: median {median:.1f} ms over {args.runs} runs, budget {budget:.0f} ms'
+              + (' - OVER BUDGET' if over else ''))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
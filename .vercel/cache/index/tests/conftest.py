@@ -0,0 +1,7 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, '.vercel', 'python', 'py3', 'api', '_vendor'),
+                os.path.join(ROOT, 'api')]
+os.environ.setdefault('KHELONA_LOG_LEVEL', 'WARNING')
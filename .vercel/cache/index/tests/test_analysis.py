@@ -0,0 +1,61 @@
+import pytest
+
+import index
+
+
+@pytest.fixture
+def client():
+    return index.app.test_client()
+
+
+def new_game(client, game_type='tic-tac-toe', players=('a', 'b')):
+    code = client.post('/create_game', json={'game_type': game_type}).get_json()['code']
+    for player in players:
+        client.post('/join_game', json={'code': code, 'player': player})
+    return code
+
+
+def play(client, code, *moves):
+    for n, cell in enumerate(moves):
+        response = client.post('/make_move', json={'code': code, 'index': cell, 'player': 'ab'[n % 2]})
+        assert response.status_code == 200
+
+
+def test_new_game_is_a_draw_everywhere(client):
+    code = new_game(client)
+    response = client.get(f'/analysis/{code}')
+    body = response.get_json()
+    assert body['turn'] == 0 and not body['game_over']
+    assert body['moves'] == [{'cell': cell, 'result': 'draw', 'distance': 9} for cell in range(9)]
+    assert response.headers['ETag'] == f'"{body["version"]}"'
+
+
+@pytest.mark.parametrize('game_type', ['tic-tac-toe', 'tic-tac-toe-bitboard'])
+def test_rates_each_cell(client, game_type):
+    # X holds 0 and 1, O holds 3 and 4: X wins at 2, must otherwise block at 5
+    code = new_game(client, game_type)
+    play(client, code, 0, 3, 1, 4)
+    moves = {move['cell']: move for move in client.get(f'/analysis/{code}').get_json()['moves']}
+    assert sorted(moves) == [2, 5, 6, 7, 8]
+    assert moves[2] == {'cell': 2, 'result': 'win', 'distance': 1}
+    assert moves[5]['result'] == 'draw'
+    assert {moves[cell]['result'] for cell in (6, 7, 8)} == {'loss'}
+
+
+def test_finished_game_has_no_moves(client):
+    code = new_game(client)
+    play(client, code, 0, 3, 1, 4, 2)
+    body = client.get(f'/analysis/{code}').get_json()
+    assert body['game_over'] and body['moves'] == []
+
+
+def test_computer_never_leaves_a_win(client):
+    code = new_game(client, 'vs-computer', players=('a',))
+    client.post('/make_move', json={'code': code, 'index': 1, 'player': 'a'})
+    body = client.get(f'/analysis/{code}').get_json()
+    assert body['turn'] == 0 and len(body['moves']) == 7
+    assert 'win' not in {move['result'] for move in body['moves']}
+
+
+def test_unknown_game(client):
+    assert client.get('/analysis/NOPE00').status_code == 404
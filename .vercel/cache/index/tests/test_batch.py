@@ -0,0 +1,112 @@
+import pytest
+
+from actions import GameActions
+import batch
+from batch import run_batch
+from store import MemoryGameStore
+from waiters import GameWaiters
+
+
+@pytest.fixture
+def actions():
+    codes = iter(f'G{n:05d}' for n in range(1000))
+    return GameActions(MemoryGameStore(), GameWaiters(), lambda: next(codes))
+
+
+def start_game(actions):
+    code = actions.create('tic-tac-toe')
+    actions.join(code, 'a')
+    actions.join(code, 'b')
+    return code
+
+
+def test_references(actions):
+    results = run_batch(actions, [
+        {'op': 'create_game'},
+        {'op': 'join_game', 'code': '$0', 'player': 'a'},
+        {'op': 'join_game', 'code': '$0', 'player': 'b'},
+        {'op': 'make_move', 'code': '$0', 'index': 4, 'player': 'a'},
+        {'op': 'join_game', 'code': '$1', 'player': 'c'},
+        {'op': 'join_game', 'code': '$9', 'player': 'c'},
+    ])
+    assert [r['ok'] for r in results] == [True, True, True, True, False, False]
+    assert results[3]['state']['board'][4] == 'X'
+    assert results[4]['error'] == results[5]['error'] == 'Unknown game reference'
+
+
+def test_atomic_rollback(actions):
+    code = start_game(actions)
+    results = run_batch(actions, [
+        {'op': 'make_move', 'code': code, 'index': 4, 'player': 'a'},
+        {'op': 'make_move', 'code': code, 'index': 4, 'player': 'b'},
+    ], atomic=True)
+    assert results[0] == {'ok': False, 'error': 'Rolled back', 'status': 409}
+    assert results[1]['error'] == 'Invalid move'
+    game = actions.games.get(code)
+    assert game['version'] == 3
+    assert game['state']['board'][4] == ''
+
+
+def test_atomic_commits_once(actions):
+    code = start_game(actions)
+    results = run_batch(actions, [
+        {'op': 'make_move', 'code': code, 'index': 4, 'player': 'a'},
+        {'op': 'make_move', 'code': code, 'index': 0, 'player': 'b'},
+    ], atomic=True)
+    assert all(r['ok'] for r in results)
+    assert actions.games.version(code) == 4
+
+
+def test_non_atomic_keeps_earlier_writes(actions):
+    code = start_game(actions)
+    results = run_batch(actions, [
+        {'op': 'make_move', 'code': code, 'index': 4, 'player': 'a'},
+        {'op': 'make_move', 'code': code, 'index': 4, 'player': 'b'},
+    ])
+    assert results[0]['ok'] and not results[1]['ok']
+    assert actions.games.get(code)['state']['board'][4] == 'X'
+
+
+@pytest.mark.parametrize('atomic', [False, True])
+def test_unexpected_errors_become_results(actions, atomic, monkeypatch):
+    def broken_move(game, idx, player):
+        raise RuntimeError('boom')
+
+    code = start_game(actions)
+    monkeypatch.setattr(batch, 'apply_move', broken_move)
+    results = run_batch(actions, [
+        {'op': 'send_message', 'code': code, 'player': 'a', 'message': 'hi'},
+        {'op': 'make_move', 'code': code, 'index': 4, 'player': 'a'},
+    ], atomic=atomic)
+    assert results[1] == {'ok': False, 'error': 'boom', 'status': 500}
+    assert results[0]['ok'] is not atomic
+
+
+@pytest.mark.parametrize('index', [-1, 9, 99, 'z', None, True])
+def test_bad_index_is_an_invalid_move(actions, index):
+    code = start_game(actions)
+    results = run_batch(actions, [{'op': 'make_move', 'code': code, 'index': index, 'player': 'a'}])
+    assert results[0]['ok'] is False and results[0]['status'] == 400
+    assert actions.games.get(code)['state']['board'] == [''] * 9
+
+
+def test_atomic_snapshots_only_version_the_last_state(actions):
+    code = actions.create('tic-tac-toe')
+    results = run_batch(actions, [
+        {'op': 'join_game', 'code': code, 'player': 'a'},
+        {'op': 'game_state', 'code': code},
+        {'op': 'join_game', 'code': code, 'player': 'b'},
+        {'op': 'game_state', 'code': code},
+    ], atomic=True)
+    assert results[1]['state']['players'] == ['a']
+    assert results[1]['version'] is None
+    assert results[3]['state']['players'] == ['a', 'b']
+    assert results[3]['version'] == actions.games.version(code)
+
+
+@pytest.mark.parametrize('body', [[], [{'op': 'create_game'}], 'ops', {'ops': 'x'}])
+def test_route_rejects_malformed_bodies(body):
+    import index
+    response = index.app.test_client().post('/batch', json=body)
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Invalid request'}
@@ -0,0 +1,57 @@
+import copy
+
+import pytest
+
+from games import game_view
+from games.tic_tac_toe import create_tic_tac_toe_game, handle_tic_tac_toe_move
+from games.tic_tac_toe_bitboard import bitboard_view, create_bitboard_game, handle_bitboard_move
+
+
+def test_view_of_new_game():
+    assert bitboard_view(create_bitboard_game()) == create_tic_tac_toe_game()
+
+
+def test_matches_list_engine_on_every_reachable_position():
+    # Walk every legal game, playing each move on both engines side by side
+    seen = set()
+    stack = [(create_tic_tac_toe_game(), create_bitboard_game())]
+    while stack:
+        listed, bits = stack.pop()
+        assert bitboard_view(bits) == listed
+        key = tuple(listed['board'])
+        if key in seen:
+            continue
+        seen.add(key)
+        for cell in range(9):
+            next_listed, next_bits = copy.deepcopy(listed), copy.deepcopy(bits)
+            valid, _ = handle_tic_tac_toe_move(next_listed, listed['turn'], cell)
+            assert handle_bitboard_move(next_bits, bits['turn'], cell)[0] == valid
+            if valid:
+                stack.append((next_listed, next_bits))
+    assert len(seen) == 5478
+
+
+def test_win_sets_winning_line():
+    game = create_bitboard_game()
+    for player, cell in [(0, 2), (1, 0), (0, 4), (1, 1), (0, 6)]:
+        assert handle_bitboard_move(game, player, cell)[0]
+    view = game_view('tic-tac-toe-bitboard', game)
+    assert view['winner'] == 'X' and view['game_over']
+    assert view['winning_line'] == [2, 4, 6]
+    assert view['board'] == ['O', 'O', 'X', '', 'X', '', 'X', '', '']
+
+
+@pytest.mark.parametrize('cell', [-1, 9, 1.5, '4', None])
+def test_rejects_bad_cells(cell):
+    game = create_bitboard_game()
+    assert handle_bitboard_move(game, 0, cell) == (False, game)
+    assert game['marks'] == [0, 0]
+
+
+def test_rejects_taken_cell_and_moves_after_the_end():
+    game = create_bitboard_game()
+    handle_bitboard_move(game, 0, 4)
+    assert not handle_bitboard_move(game, 1, 4)[0]
+    game['game_over'] = True
+    assert not handle_bitboard_move(game, 1, 0)[0]
+    assert game['marks'] == [1 << 4, 0]
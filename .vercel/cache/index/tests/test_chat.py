@@ -0,0 +1,48 @@
+from chat import append_message, last_message_id, messages_after
+
+
+def new_game(capacity=3):
+    return {'type': 'tic-tac-toe', 'state': {'players': ['a', 'b']}, 'message_capacity': capacity}
+
+
+def test_ids_and_expansion():
+    game = new_game()
+    first = append_message(game, 0, 'hi')
+    second = append_message(game, 1, 'hey')
+    assert (first['id'], first['player'], first['message']) == (1, 'a', 'hi')
+    assert (second['id'], second['player'], second['player_index']) == (2, 'b', 1)
+    assert last_message_id(game) == 2
+    assert [m['id'] for m in messages_after(game)] == [1, 2]
+    assert [m['id'] for m in messages_after(game, 1)] == [2]
+
+
+def test_ring_buffer_overwrites_oldest():
+    game = new_game(capacity=3)
+    for i in range(1, 8):
+        append_message(game, 0, f'm{i}')
+    assert len(game['messages']) == 3
+    messages = messages_after(game)
+    assert [m['id'] for m in messages] == [5, 6, 7]
+    assert [m['message'] for m in messages] == ['m5', 'm6', 'm7']
+
+
+def test_cursor_behind_buffer_skips_overwritten():
+    game = new_game(capacity=3)
+    for i in range(1, 6):
+        append_message(game, 0, f'm{i}')
+    assert [m['id'] for m in messages_after(game, 1)] == [3, 4, 5]
+    assert [m['id'] for m in messages_after(game, 4)] == [5]
+    assert messages_after(game, 5) == []
+
+
+def test_limit():
+    game = new_game(capacity=10)
+    for i in range(1, 6):
+        append_message(game, 0, f'm{i}')
+    assert [m['id'] for m in messages_after(game, 1, limit=2)] == [2, 3]
+
+
+def test_empty():
+    game = new_game()
+    assert last_message_id(game) == 0
+    assert messages_after(game) == []
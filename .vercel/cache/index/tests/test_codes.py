@@ -0,0 +1,56 @@
+import pytest
+
+from codes import CODE_LENGTH, CodeAllocator, create_code_allocator
+from store import MemoryGameStore, SqliteGameStore
+
+
+def test_round_trip():
+    allocator = CodeAllocator('secret')
+    for n in list(range(1000)) + [allocator.size - 1]:
+        code = allocator.code(n)
+        assert len(code) == CODE_LENGTH
+        assert allocator.decode(code) == (0, n)
+
+
+def test_codes_are_distinct():
+    allocator = CodeAllocator('secret')
+    codes = [allocator.code(n) for n in range(5000)]
+    assert len(set(codes)) == len(codes)
+
+
+def test_key_changes_codes():
+    assert CodeAllocator('a').code(0) != CodeAllocator('b').code(0)
+
+
+def test_instance_ranges():
+    allocators = [CodeAllocator('secret', instance_bits=2, instance_id=i) for i in range(4)]
+    for instance_id, allocator in enumerate(allocators):
+        for n in (0, 1, allocator.size - 1):
+            assert allocator.decode(allocator.code(n)) == (instance_id, n)
+    assert len({allocator.code(0) for allocator in allocators}) == 4
+
+
+def test_out_of_range():
+    allocator = CodeAllocator('secret', instance_bits=4)
+    with pytest.raises(ValueError):
+        allocator.code(allocator.size)
+    with pytest.raises(ValueError):
+        CodeAllocator('secret', instance_bits=1, instance_id=2)
+
+
+@pytest.mark.parametrize('code', ['', 'ABC', 'abcdef', 'ABC-12', None])
+def test_decode_malformed(code):
+    assert CodeAllocator('secret').decode(code) is None
+
+
+def test_workers_sharing_a_sqlite_store_never_collide(tmp_path, monkeypatch):
+    monkeypatch.delenv('KHELONA_CODE_KEY', raising=False)
+    path = str(tmp_path / 'games.db')
+    first, second = (create_code_allocator(SqliteGameStore(path)) for _ in range(2))
+    # The counter is shared, so codes are distinct as long as both map ids alike
+    assert [first.code(n) for n in range(100)] == [second.code(n) for n in range(100)]
+
+
+def test_key_setting_wins(monkeypatch):
+    monkeypatch.setenv('KHELONA_CODE_KEY', 'secret')
+    assert create_code_allocator(MemoryGameStore()).code(7) == CodeAllocator('secret').code(7)
@@ -0,0 +1,79 @@
+import pytest
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+import index
+from cors import DEFAULT_MAX_AGE, CorsMiddleware, create_cors
+
+
+def app(environ, start_response):
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [b'ok']
+
+
+def call(wsgi_app, method='GET', **headers):
+    environ = EnvironBuilder(path='/x', method=method, headers=headers).get_environ()
+    body, status, response_headers = run_wsgi_app(wsgi_app, environ, buffered=True)
+    return status, response_headers, b''.join(body)
+
+
+def preflight(wsgi_app, origin='https://a.example'):
+    return call(wsgi_app, 'OPTIONS', Origin=origin, **{
+        'Access-Control-Request-Method': 'POST',
+        'Access-Control-Request-Headers': 'Content-Type'})
+
+
+def test_wildcard_headers_on_every_response():
+    status, headers, body = call(CorsMiddleware(app))
+    assert (status, body) == ('200 OK', b'ok')
+    assert headers['Access-Control-Allow-Origin'] == '*'
+    assert headers['Access-Control-Expose-Headers'] == 'ETag'
+    assert 'Vary' not in headers
+
+
+def test_preflight_is_answered_with_max_age():
+    seen = []
+    status, headers, body = preflight(CorsMiddleware(app, on_request=lambda *args: seen.append(args[:3])))
+    assert status == '204 NO CONTENT' and body == b''
+    assert headers['Access-Control-Allow-Origin'] == '*'
+    assert headers['Access-Control-Max-Age'] == str(DEFAULT_MAX_AGE)
+    assert 'POST' in headers['Access-Control-Allow-Methods']
+    assert 'Content-Type' in headers['Access-Control-Allow-Headers']
+    assert seen == [('preflight', 'OPTIONS', 204)]
+
+
+def test_plain_options_reaches_the_app():
+    assert call(CorsMiddleware(app), 'OPTIONS')[2] == b'ok'
+
+
+def test_listed_origins():
+    cors = CorsMiddleware(app, ['https://a.example', 'https://b.example'])
+    headers = call(cors, Origin='https://b.example')[1]
+    assert headers['Access-Control-Allow-Origin'] == 'https://b.example'
+    assert headers['Vary'] == 'Origin'
+    assert preflight(cors)[1]['Access-Control-Allow-Origin'] == 'https://a.example'
+
+
+def test_other_origins_get_no_cors_headers():
+    cors = CorsMiddleware(app, ['https://a.example'])
+    status, headers, body = call(cors, Origin='https://evil.example')
+    assert body == b'ok' and 'Access-Control-Allow-Origin' not in headers
+    assert headers['Vary'] == 'Origin'
+    # Their preflight goes on to the app, which doesn't answer it with CORS headers
+    status, headers, body = preflight(cors, 'https://evil.example')
+    assert body == b'ok' and 'Access-Control-Allow-Origin' not in headers
+
+
+def test_create_cors_reads_environment(monkeypatch):
+    monkeypatch.setenv('KHELONA_CORS_ORIGINS', 'https://a.example, https://b.example,')
+    monkeypatch.setenv('KHELONA_CORS_MAX_AGE', '600')
+    headers = preflight(create_cors(app), 'https://b.example')[1]
+    assert headers['Access-Control-Allow-Origin'] == 'https://b.example'
+    assert headers['Access-Control-Max-Age'] == '600'
+    assert 'Access-Control-Allow-Origin' not in call(create_cors(app), Origin='https://c.example')[1]
+
+
+@pytest.mark.parametrize('path', ['/stats', '/game_state/NOPE00'])
+def test_app_routes_get_cors_headers(path):
+    # Both the Flask routes and the fast path sit inside the CORS layer
+    response = index.app.test_client().get(path, headers={'Origin': 'https://a.example'})
+    assert response.headers.getlist('Access-Control-Allow-Origin') == ['*']
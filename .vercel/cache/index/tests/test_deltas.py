@@ -0,0 +1,64 @@
+from chat import append_message
+from deltas import CHANGE_LOG_SIZE, delta_since, diff_states, merge_patches, record_change, snapshot
+from games import create_game
+
+
+def test_diff_states():
+    old = {'board': ['', '', ''], 'turn': 0, 'players': ['a']}
+    new = {'board': ['X', '', 'O'], 'turn': 1, 'players': ['a']}
+    assert diff_states(old, new) == {'cells': [[0, 'X'], [2, 'O']], 'turn': 1}
+
+
+def test_merge_patches():
+    merged = merge_patches([
+        {'cells': [[4, 'X']], 'turn': 1},
+        {'messages_after': 2},
+        {'cells': [[0, 'O'], [4, 'X']], 'turn': 0, 'messages_after': 3},
+    ])
+    assert merged == {'cells': [[0, 'O'], [4, 'X']], 'turn': 0, 'messages_after': 2}
+
+
+def test_merge_nothing():
+    assert merge_patches([]) == {}
+
+
+def write(game, change):
+    before = snapshot(game)
+    change(game)
+    record_change(game, before)
+    game['version'] += 1
+
+
+def new_game():
+    game = {'type': 'tic-tac-toe', 'state': create_game('tic-tac-toe'), 'version': 1}
+    write(game, lambda g: g['state']['players'].extend(['a', 'b']))
+    return game
+
+
+def test_delta_since():
+    game = new_game()
+    write(game, lambda g: g['state']['board'].__setitem__(4, 'X'))
+    write(game, lambda g: append_message(g, 0, 'hi'))
+    assert delta_since(game, game['version']) == {}
+    assert delta_since(game, 2) == {'cells': [[4, 'X']], 'messages': [
+        {'id': 1, 'player': 'a', 'player_index': 0, 'message': 'hi',
+         'timestamp': game['messages'][0][0]}]}
+    assert delta_since(game, 3)['messages'][0]['id'] == 1
+    assert delta_since(game, game['version'] + 1) is None
+
+
+def test_delta_messages_follow_ring_buffer():
+    game = new_game()
+    game['message_capacity'] = 3
+    for i in range(5):
+        write(game, lambda g: append_message(g, 0, f'm{i}'))
+    assert [m['id'] for m in delta_since(game, 2)['messages']] == [3, 4, 5]
+
+
+def test_change_log_is_bounded():
+    game = new_game()
+    for i in range(CHANGE_LOG_SIZE + 5):
+        write(game, lambda g: append_message(g, 0, 'x'))
+    assert len(game['changes']) == CHANGE_LOG_SIZE
+    assert delta_since(game, 1) is None
+    assert delta_since(game, game['version'] - CHANGE_LOG_SIZE) is not None
@@ -0,0 +1,72 @@
+import threading
+
+import pytest
+
+import index
+from events import state_event
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(index, 'SSE_HEARTBEAT_SECONDS', 0.05)
+    return index.app.test_client()
+
+
+def new_game(client):
+    code = client.post('/create_game').get_json()['code']
+    client.post('/join_game', json={'code': code, 'player': 'a'})
+    return code
+
+
+def test_state_event():
+    entry = (7, b'{"version":7}\n', None)
+    assert state_event(entry) == b'id: 7\nevent: state\ndata: {"version":7}\n\n'
+
+
+def test_sends_current_state_first(client):
+    code = new_game(client)
+    response = client.get(f'/games/{code}/events', buffered=False)
+    assert response.mimetype == 'text/event-stream'
+    assert response.headers['Cache-Control'] == 'no-cache'
+    chunks = iter(response.response)
+    assert next(chunks) == b'retry: 3000\n\n'
+    state = client.get(f'/game_state/{code}')
+    assert next(chunks) == b'id: %s\nevent: state\ndata: %s\n\n' % (
+        state.headers['ETag'].strip('"').encode(), state.get_data().rstrip(b'\n'))
+    response.close()
+
+
+@pytest.mark.parametrize('resume', ['header', 'query'])
+def test_resumes_after_last_event_id(client, resume):
+    code = new_game(client)
+    version = index.games.version(code)
+    if resume == 'header':
+        response = client.get(f'/games/{code}/events', headers={'Last-Event-ID': str(version)},
+                              buffered=False)
+    else:
+        response = client.get(f'/games/{code}/events?last_event_id={version}', buffered=False)
+    chunks = iter(response.response)
+    next(chunks)
+    assert next(chunks) == b': heartbeat\n\n'
+
+    threading.Timer(0.05, lambda: index.app.test_client().post(
+        '/join_game', json={'code': code, 'player': 'b'})).start()
+    while (chunk := next(chunks)) == b': heartbeat\n\n':
+        pass
+    assert chunk.startswith(b'id: %d\nevent: state\n' % (version + 1))
+    assert b'"players":["a","b"]' in chunk
+    response.close()
+
+
+def test_deleted_game_ends_stream(client):
+    code = new_game(client)
+    response = client.get(f'/games/{code}/events', buffered=False)
+    chunks = iter(response.response)
+    next(chunks), next(chunks)
+    index.games.delete(code)
+    index.game_waiters.notify(code)
+    assert list(chunks)[-1] == b'event: gone\ndata: {}\n\n'
+
+
+def test_unknown_game(client):
+    assert client.get('/games/NOPE00/events').status_code == 404
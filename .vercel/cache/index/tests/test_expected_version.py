@@ -0,0 +1,67 @@
+import pytest
+
+import index
+
+
+@pytest.fixture
+def client():
+    return index.app.test_client()
+
+
+def new_game(client, *players):
+    code = client.post('/create_game').get_json()['code']
+    for player in players:
+        client.post('/join_game', json={'code': code, 'player': player})
+    return code
+
+
+def test_move_at_expected_version(client):
+    code = new_game(client, 'a', 'b')
+    version = index.games.version(code)
+    response = client.post('/make_move', json={'code': code, 'index': 4, 'player': 'a',
+                                               'expected_version': version})
+    assert response.status_code == 200
+    assert response.get_json()['version'] == version + 1
+
+
+def test_stale_move_gets_current_state(client):
+    code = new_game(client, 'a', 'b')
+    version = index.games.version(code)
+    client.post('/make_move', json={'code': code, 'index': 4, 'player': 'a'})
+    response = client.post('/make_move', json={'code': code, 'index': 0, 'player': 'b',
+                                               'expected_version': version})
+    assert response.status_code == 409
+    body = response.get_json()
+    assert body['error'] == 'Game has changed'
+    assert body['version'] == version + 1
+    assert body['state']['board'] == ['', '', '', '', 'X', '', '', '', '']
+    assert response.headers['ETag'] == f'"{version + 1}"'
+    assert index.games.version(code) == version + 1
+
+
+def test_stale_join(client):
+    code = new_game(client, 'a')
+    client.post('/send_message', json={'code': code, 'player': 'a', 'message': 'hi'})
+    response = client.post('/join_game', json={'code': code, 'player': 'b', 'expected_version': 1})
+    assert response.status_code == 409
+    assert response.get_json()['state']['players'] == ['a']
+
+
+@pytest.mark.parametrize('expected_version', ['2', True, 1.0])
+def test_invalid_expected_version(client, expected_version):
+    code = new_game(client, 'a')
+    response = client.post('/join_game', json={'code': code, 'player': 'b',
+                                               'expected_version': expected_version})
+    assert response.status_code == 400
+    assert index.games.get(code)['state']['players'] == ['a']
+
+
+def test_batch_ops_check_expected_version(client):
+    code = new_game(client, 'a', 'b')
+    version = index.games.version(code)
+    results = client.post('/batch', json={'ops': [
+        {'op': 'make_move', 'code': code, 'index': 4, 'player': 'a', 'expected_version': version},
+        {'op': 'make_move', 'code': code, 'index': 0, 'player': 'b', 'expected_version': version},
+    ]}).get_json()['results']
+    assert results[0]['ok'] and results[0]['version'] == version + 1
+    assert results[1] == {'ok': False, 'error': 'Game has changed', 'status': 409}
@@ -0,0 +1,91 @@
+import gzip
+
+import pytest
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+import index
+from cors import create_cors
+from fastpath import GameStateFastPath, etag_matches
+
+
+@pytest.fixture
+def code():
+    client = index.app.test_client()
+    code = client.post('/create_game').get_json()['code']
+    client.post('/join_game', json={'code': code, 'player': 'a'})
+    return code
+
+
+def call(wsgi_app, path, **headers):
+    environ = EnvironBuilder(path=path, headers=headers).get_environ()
+    body, status, response_headers = run_wsgi_app(wsgi_app, environ, buffered=True)
+    # Server-Timing carries this request's own durations
+    return status, [h for h in response_headers.to_wsgi_list() if h[0] != 'Server-Timing'], b''.join(body)
+
+
+def both(path, **headers):
+    # index.app.wsgi_app is the CORS layer around the fast path around Flask
+    fast = index.app.wsgi_app
+    assert isinstance(fast.app, GameStateFastPath)
+    flask_only = create_cors(fast.app.app)
+    return call(fast, path, **headers), call(flask_only, path, **headers)
+
+
+def test_full_state_matches_flask(code):
+    fast, flask = both(f'/game_state/{code}', Origin='https://khelona.example')
+    assert fast[0] == '200 OK'
+    assert fast == flask
+
+
+@pytest.mark.parametrize('if_none_match', ['"{v}"', '"0", "{v}"', '*', 'W/"{v}"', '"999"'])
+def test_revalidation_matches_flask(code, if_none_match):
+    version = index.games.version(code)
+    fast, flask = both(f'/game_state/{code}', **{'If-None-Match': if_none_match.format(v=version)})
+    assert fast == flask
+
+
+def test_unknown_game_matches_flask():
+    fast, flask = both('/game_state/NOPE00')
+    assert fast[0].startswith('404')
+    assert fast == flask
+
+
+def test_gzip_matches_flask(code, monkeypatch):
+    monkeypatch.setattr(index.state_cache, 'gzip_level', 6)
+    index.app.test_client().post('/join_game', json={'code': code, 'player': 'b'})
+    fast, flask = both(f'/game_state/{code}', **{'Accept-Encoding': 'gzip'})
+    assert ('Content-Encoding', 'gzip') in fast[1]
+    assert fast == flask
+    assert gzip.decompress(fast[2]) == call(index.app.wsgi_app, f'/game_state/{code}')[2]
+
+
+def test_other_requests_reach_flask(code):
+    calls = []
+
+    def app(environ, start_response):
+        calls.append(environ['PATH_INFO'])
+        start_response('200 OK', [])
+        return [b'']
+
+    fast = GameStateFastPath(app, index.games, index.state_cache)
+    for path in (f'/game_state/{code}?since=0', f'/game_state/{code}/x', '/game_state/', '/stats'):
+        call(fast, path)
+    assert len(calls) == 4
+
+
+def test_reports_requests(code):
+    seen = []
+    fast = GameStateFastPath(None, index.games, index.state_cache,
+                             lambda *args: seen.append(args[:3]))
+    call(fast, f'/game_state/{code}')
+    call(fast, '/game_state/NOPE00')
+    assert seen == [('/game_state/<code>', 'GET', 200), ('/game_state/<code>', 'GET', 404)]
+
+
+def test_etag_matches():
+    assert etag_matches('"3"', '3')
+    assert etag_matches(' "1" , "3"', '3')
+    assert etag_matches('*', '3')
+    assert not etag_matches('W/"3"', '3')
+    assert not etag_matches('"33"', '3')
+    assert not etag_matches('', '3')
@@ -0,0 +1,28 @@
+import pytest
+
+import index
+
+
+@pytest.fixture
+def client():
+    return index.app.test_client()
+
+
+def new_game(client, *players):
+    code = client.post('/create_game').get_json()['code']
+    for player in players:
+        client.post('/join_game', json={'code': code, 'player': player})
+    return code
+
+
+def test_state_reports_last_message_id(client):
+    code = new_game(client, 'a', 'b')
+    before = client.get(f'/game_state/{code}').get_json()
+    assert before['last_message_id'] == 0
+    client.post('/send_message', json={'code': code, 'player': 'b', 'message': 'hi'})
+    after = client.get(f'/game_state/{code}').get_json()
+    assert after['version'] == before['version'] + 1
+    assert after['state'] == before['state']
+    assert after['last_message_id'] == 1
+    messages = client.get(f'/get_messages/{code}?after={before["last_message_id"]}').get_json()['messages']
+    assert [m['id'] for m in messages] == [1]
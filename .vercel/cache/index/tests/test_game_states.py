@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+import index
+
+
+@pytest.fixture
+def client():
+    return index.app.test_client()
+
+
+def new_game(client, *players):
+    code = client.post('/create_game').get_json()['code']
+    for player in players:
+        client.post('/join_game', json={'code': code, 'player': player})
+    return code
+
+
+def expected(client, codes, unchanged=(), missing=()):
+    games = {}
+    for code in codes:
+        games[code] = client.get(f'/game_state/{code}').get_json()
+    return {'games': games, 'unchanged': list(unchanged), 'missing': list(missing)}
+
+
+def test_bulk_states(client):
+    first, second, third = new_game(client, 'a'), new_game(client, 'a', 'b'), new_game(client)
+    seen = client.get(f'/game_state/{third}').get_json()['version']
+    response = client.post('/game_states', json={'codes': {first: None, second: 1, third: seen, 'NOPE00': None}})
+    assert response.status_code == 200
+    assert response.get_json() == expected(client, [first, second], [third], ['NOPE00'])
+
+
+def test_bulk_body_matches_jsonify(client):
+    codes = [new_game(client, 'a'), new_game(client, 'b')]
+    response = client.get('/game_states?codes=' + ','.join(codes + ['NOPE00', 'NO PE']))
+    with index.app.app_context():
+        reference = index.jsonify(expected(client, sorted(codes), [], ['NOPE00', 'NO PE'])).get_data()
+    assert response.get_data() == reference
+    assert json.loads(response.get_data())['missing'] == ['NOPE00', 'NO PE']
+
+
+@pytest.mark.parametrize('body', [[], ['ABC'], {'codes': 'ABC'}, {'codes': [1, None]}])
+def test_rejects_malformed_bodies(client, body):
+    response = client.post('/game_states', json=body)
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Invalid request'}
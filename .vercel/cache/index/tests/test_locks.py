@@ -0,0 +1,71 @@
+import itertools
+import sys
+import threading
+
+import pytest
+
+from actions import GameActions
+from locks import StripedLocks
+from store import MemoryGameStore
+from waiters import GameWaiters
+
+
+class CountingStore(MemoryGameStore):
+    """Counts writes that lost a compare-and-set race"""
+
+    def __init__(self):
+        super().__init__()
+        self.conflicts = 0
+
+    def compare_and_set(self, code, expected_version, game):
+        version = super().compare_and_set(code, expected_version, game)
+        if version is None:
+            self.conflicts += 1
+        return version
+
+
+@pytest.fixture
+def switch_often():
+    # Switch threads as often as possible to interleave the writers
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_same_code_same_lock():
+    locks = StripedLocks(16)
+    assert locks.lock_for('ABC123') is locks.lock_for('ABC123')
+    assert len({id(locks.lock_for(f'G{n}')) for n in range(1000)}) == 16
+
+
+def test_other_stripes_are_not_blocked():
+    locks = StripedLocks(16)
+    codes = (f'G{n}' for n in itertools.count())
+    first = next(codes)
+    other = next(code for code in codes if locks.lock_for(code) is not locks.lock_for(first))
+    with locks.lock_for(first):
+        assert locks.lock_for(other).acquire(blocking=False)
+        locks.lock_for(other).release()
+        assert not locks.lock_for(first).acquire(blocking=False)
+
+
+def test_concurrent_writes_to_one_game_never_conflict(switch_often):
+    games = CountingStore()
+    codes = iter(['ABC123'])
+    actions = GameActions(games, GameWaiters(), lambda: next(codes))
+    code = actions.create('tic-tac-toe')
+    actions.join(code, 'a')
+    conflicts = games.conflicts
+
+    def chat(n):
+        for i in range(25):
+            actions.send_message(code, 'a', f'{n}-{i}')
+
+    threads = [threading.Thread(target=chat, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert games.conflicts == conflicts
+    assert games.get(code)['next_message_id'] == 201
@@ -0,0 +1,39 @@
+import json
+import logging
+
+from logs import DEFAULT_SAMPLE_RATES, JsonFormatter, RouteSampler, create_access_sampler, parse_sample_rates
+
+
+def test_parse_sample_rates():
+    assert parse_sample_rates('/game_state/<code>=0.5, /batch=1') == {'/game_state/<code>': 0.5, '/batch': 1.0}
+    assert parse_sample_rates('') == {}
+
+
+def test_sampler():
+    sampler = RouteSampler({'/never': 0.0, '/always': 1.0})
+    assert not any(sampler.keep('/never') for _ in range(100))
+    assert all(sampler.keep('/always') for _ in range(100))
+    assert sampler.keep('/unlisted')
+
+
+def test_polls_are_sampled_by_default(monkeypatch):
+    monkeypatch.delenv('KHELONA_LOG_SAMPLE', raising=False)
+    assert create_access_sampler().rates == DEFAULT_SAMPLE_RATES
+    assert DEFAULT_SAMPLE_RATES['/game_state/<code>'] < 0.01
+
+
+def test_sample_setting_overrides_defaults(monkeypatch):
+    monkeypatch.setenv('KHELONA_LOG_SAMPLE', '/game_state/<code>=1,/batch=0.5')
+    rates = create_access_sampler().rates
+    assert rates['/game_state/<code>'] == 1.0
+    assert rates['/batch'] == 0.5
+    assert rates['/get_messages/<code>'] == DEFAULT_SAMPLE_RATES['/get_messages/<code>']
+
+
+def test_json_formatter_includes_extra():
+    record = logging.LogRecord('khelona.test', logging.INFO, __file__, 1, 'request', None, None)
+    record.route = '/batch'
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry['message'] == 'request'
+    assert entry['route'] == '/batch'
+    assert entry['level'] == 'INFO'
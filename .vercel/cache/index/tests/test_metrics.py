@@ -0,0 +1,50 @@
+import threading
+
+import metrics
+from metrics import RequestMetrics, render_metrics
+from store import MemoryGameStore
+
+
+def observe_in_thread(request_metrics, *args):
+    thread = threading.Thread(target=request_metrics.observe, args=args)
+    thread.start()
+    thread.join()
+
+
+def test_counts_survive_exited_threads():
+    request_metrics = RequestMetrics()
+    for _ in range(3):
+        observe_in_thread(request_metrics, '/game_state/<code>', 'GET', 200, 0.002, {'lookup': 0.001})
+    request_metrics.observe('/game_state/<code>', 'GET', 304, 0.0005)
+    totals = request_metrics.snapshot()
+    assert totals.requests == {('/game_state/<code>', 'GET', 200): 3, ('/game_state/<code>', 'GET', 304): 1}
+    assert totals.phases[('/game_state/<code>', 'lookup')] == [3, 0.003]
+
+
+def test_thread_per_request_registration_is_bounded(monkeypatch):
+    monkeypatch.setattr(metrics, 'MIN_SWEEP_THREADS', 8)
+    request_metrics = RequestMetrics()
+    scanned = []  # registry size at each sweep
+    retire = request_metrics._retire_dead_threads
+    monkeypatch.setattr(request_metrics, '_retire_dead_threads',
+                        lambda: scanned.append(len(request_metrics._threads)) or retire())
+    for _ in range(100):
+        observe_in_thread(request_metrics, '/batch', 'POST', 200, 0.01)
+    # Sweeps stay amortized O(1) per new thread, and the registry stays small
+    assert sum(scanned) <= 2 * 100
+    assert len(request_metrics._threads) <= 8
+    assert request_metrics.snapshot().requests[('/batch', 'POST', 200)] == 100
+
+
+def test_render_metrics():
+    request_metrics = RequestMetrics()
+    request_metrics.observe('/game_state/<code>', 'GET', 200, 0.003, {'lookup': 0.001})
+    store = MemoryGameStore()
+    store.put('ABC123', {'type': 'tic-tac-toe', 'state': {'players': ['a'], 'game_over': False}})
+    text = render_metrics(request_metrics, store)
+    assert '# TYPE khelona_requests_total counter' in text
+    assert 'khelona_requests_total{route="/game_state/<code>",method="GET",status="200"} 1' in text
+    assert 'khelona_request_duration_seconds_bucket{route="/game_state/<code>",status="200",le="0.0025"} 0' in text
+    assert 'khelona_request_duration_seconds_bucket{route="/game_state/<code>",status="200",le="0.005"} 1' in text
+    assert 'khelona_request_duration_seconds_count{route="/game_state/<code>",status="200"} 1' in text
+    assert text.endswith('\n')
@@ -0,0 +1,44 @@
+import itertools
+
+from games.tic_tac_toe import check_winner
+from games.tic_tac_toe_table import REACHABLE, encode_board, lookup_winner, outcome, outcome_table
+
+
+def all_boards():
+    for cells in itertools.product(('', 'X', 'O'), repeat=9):
+        yield list(cells)
+
+
+def test_encode_board():
+    assert encode_board([''] * 9) == 0
+    assert encode_board(['X'] + [''] * 8) == 1
+    assert encode_board([''] * 8 + ['O']) == 2 * 3 ** 8
+    assert len({encode_board(board) for board in all_boards()}) == 3 ** 9
+
+
+def test_agrees_with_check_winner():
+    reachable = 0
+    for board in all_boards():
+        result = outcome(encode_board(board))
+        if result is None:
+            continue
+        reachable += 1
+        winner, line = check_winner(board)
+        assert result == (winner, line, winner is not None)
+    assert reachable == 5478
+    assert sum(1 for entry in outcome_table() if entry & REACHABLE) == reachable
+
+
+def test_unreachable_boards():
+    # Two winners, O moving first, and play continuing after a win
+    for board in (['X', 'X', 'X', 'O', 'O', 'O', '', '', ''],
+                  ['O'] + [''] * 8,
+                  ['X', 'X', 'X', 'O', 'O', '', 'O', '', '']):
+        assert outcome(encode_board(board)) is None
+
+
+def test_lookup_winner_falls_back_on_unreachable_boards():
+    board = ['X', 'X', 'X', 'O', 'O', 'O', '', '', '']
+    assert lookup_winner(board) == check_winner(board)
+    board = ['O', 'O', 'O'] + [''] * 6
+    assert lookup_winner(board) == ('O', [0, 1, 2])
@@ -0,0 +1,70 @@
+import base64
+import itertools
+import zlib
+
+from games import tic_tac_toe_solved
+from games.tic_tac_toe import check_winner
+from games.tic_tac_toe_solver import best_move, move_values, solve_tables
+from games.tic_tac_toe_table import REACHABLE, encode_board, outcome_table
+
+
+def live_boards():
+    table = outcome_table()
+    for cells in itertools.product(('', 'X', 'O'), repeat=9):
+        board = list(cells)
+        entry = table[encode_board(board)]
+        if entry & REACHABLE and not entry >> 4 & 0b11:
+            yield board
+
+
+def test_checked_in_tables_are_current():
+    best_moves, values = solve_tables()
+    assert zlib.decompress(base64.b85decode(tic_tac_toe_solved.TABLES)) == best_moves + values
+
+
+def test_empty_board_is_a_draw():
+    values = move_values([''] * 9)
+    assert sorted(values) == list(range(9))
+    assert all(value == 0 and distance == 9 for value, distance in values.values())
+
+
+def test_takes_a_win_over_a_block():
+    # X to move wins at 2; blocking O at 5 only draws, anything else loses
+    board = ['X', 'X', '', 'O', 'O', '', '', '', '']
+    assert best_move(board) == 2
+    assert move_values(board)[2] == (1, 1)
+    assert move_values(board)[5][0] == 0
+    assert move_values(board)[8][0] == -1
+
+
+def test_finished_game_has_no_move():
+    board = ['X', 'X', 'X', 'O', 'O', '', '', '', '']
+    assert best_move(board) is None
+    assert move_values(board) == {}
+
+
+def test_best_move_is_legal_and_optimal_everywhere():
+    for board in live_boards():
+        move = best_move(board)
+        values = move_values(board)
+        assert board[move] == ''
+        assert set(values) == {cell for cell, mark in enumerate(board) if not mark}
+        assert values[move][0] == max(value for value, _ in values.values())
+
+
+def play(board, turn):
+    """Return the winner when both sides follow best_move from board"""
+    while True:
+        winner, _ = check_winner(board)
+        if winner:
+            return winner
+        board[best_move(board)] = turn
+        turn = 'O' if turn == 'X' else 'X'
+
+
+def test_perfect_play_never_loses():
+    # Whatever X opens with, perfect play from there on is at least a draw for O
+    for cell in range(9):
+        board = [''] * 9
+        board[cell] = 'X'
+        assert play(board, 'O') == 'tie'
@@ -0,0 +1,105 @@
+import gzip
+import json
+
+from flask import Flask, jsonify
+
+from games import create_game
+from state_cache import StateCache, accepts_gzip, encode_bulk_states, encode_state
+from store import MemoryGameStore
+
+
+class CountingStore(MemoryGameStore):
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def read(self, code):
+        self.reads += 1
+        return super().read(code)
+
+
+def new_game(games, code='ABC123', game_type='tic-tac-toe'):
+    games.put(code, {'type': game_type, 'state': create_game(game_type)})
+    return games.version(code)
+
+
+def test_encode_state_matches_jsonify():
+    games = MemoryGameStore()
+    new_game(games, game_type='tic-tac-toe-bitboard')
+    game = games.get('ABC123')
+    with Flask(__name__).app_context():
+        expected = jsonify({'state': {'players': [], 'board': [''] * 9, 'turn': 0, 'winner': None,
+                                      'game_over': False, 'winning_line': []},
+                            'version': 1, 'last_message_id': 0}).get_data()
+    assert encode_state(game) == expected
+
+
+def test_encode_bulk_states_matches_jsonify():
+    bodies = {'B': b'{"version":2}\n', 'A': b'{"version":1}\n'}
+    with Flask(__name__).app_context():
+        expected = jsonify({'games': {'A': {'version': 1}, 'B': {'version': 2}},
+                            'unchanged': ['C'], 'missing': ['D "x"']}).get_data()
+    assert encode_bulk_states(bodies, ['C'], ['D "x"']) == expected
+
+
+def test_encodes_once_per_version():
+    games = CountingStore()
+    cache = StateCache(games)
+    version = new_game(games)
+    entry = cache.get('ABC123', version)
+    assert cache.get('ABC123', version) is entry
+    assert games.reads == 1
+
+    game = games.get('ABC123')
+    game['state']['players'].append('a')
+    version = games.put('ABC123', game)
+    games.reads = 0
+    newer = cache.get('ABC123', version)
+    assert newer[0] == version and games.reads == 1
+    assert json.loads(newer[1])['state']['players'] == ['a']
+
+
+def test_older_version_gets_current_entry():
+    games = MemoryGameStore()
+    cache = StateCache(games)
+    version = new_game(games)
+    games.put('ABC123', games.get('ABC123'))
+    assert cache.get('ABC123', version)[0] == version + 1
+
+
+def test_missing_game_drops_entry():
+    games = MemoryGameStore()
+    cache = StateCache(games)
+    cache.get('ABC123', new_game(games))
+    games.delete('ABC123')
+    assert cache.get('ABC123', 2) is None
+    assert 'ABC123' not in cache._entries
+
+
+def test_gzipped_copy():
+    games = MemoryGameStore()
+    version, body, gzipped = StateCache(games, gzip_level=6).get('ABC123', new_game(games))
+    assert gzip.decompress(gzipped) == body
+    assert StateCache(games).get('ABC123', version)[2] is None
+
+
+def test_evicts_least_recently_changed():
+    games = MemoryGameStore()
+    cache = StateCache(games, max_entries=2)
+    versions = {code: new_game(games, code) for code in ('A', 'B', 'C')}
+    cache.get('A', versions['A'])
+    cache.get('B', versions['B'])
+    versions['A'] = games.put('A', games.get('A'))
+    cache.get('A', versions['A'])
+    cache.get('C', versions['C'])
+    assert list(cache._entries) == ['A', 'C']
+
+
+def test_accepts_gzip():
+    assert accepts_gzip('gzip, deflate, br')
+    assert accepts_gzip('br;q=1.0, GZIP;q=0.5')
+    assert accepts_gzip('*')
+    assert not accepts_gzip('')
+    assert not accepts_gzip('deflate, br')
+    assert not accepts_gzip('gzip;q=0')
+    assert not accepts_gzip('gzip; q=0.000')
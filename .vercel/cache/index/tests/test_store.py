@@ -0,0 +1,134 @@
+import pytest
+
+import store
+from store import MemoryGameStore, SqliteGameStore
+
+
+def waiting_game():
+    return {'type': 'tic-tac-toe', 'state': {'players': ['a'], 'game_over': False}}
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def games(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryGameStore()
+    return SqliteGameStore(str(tmp_path / 'games.db'))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(store.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_compare_and_set(games):
+    assert games.compare_and_set('ABC', None, waiting_game()) == 1
+    assert games.compare_and_set('ABC', None, waiting_game()) is None
+    game = games.get('ABC')
+    assert game['version'] == 1
+    game['state']['players'].append('b')
+    assert games.compare_and_set('ABC', 1, game) == 2
+    assert game['version'] == 2
+    assert games.compare_and_set('ABC', 1, waiting_game()) is None
+    assert games.get('ABC')['state']['players'] == ['a', 'b']
+
+
+def test_get_returns_copies(games):
+    games.put('ABC', waiting_game())
+    games.get('ABC')['state']['players'].append('b')
+    assert games.get('ABC')['state']['players'] == ['a']
+
+
+def test_versions(games):
+    games.put('ABC', waiting_game())
+    games.put('DEF', waiting_game())
+    games.put('DEF', waiting_game())
+    assert games.versions(['ABC', 'DEF', 'NOPE']) == {'ABC': 1, 'DEF': 2}
+    assert games.version('NOPE') is None
+
+
+def test_next_id(games):
+    assert [games.next_id() for _ in range(3)] == [0, 1, 2]
+
+
+def test_ttl_eviction(clock):
+    games = MemoryGameStore(ttls={'waiting': 10})
+    games.put('OLD', waiting_game())
+    clock[0] += 5
+    games.put('NEW', waiting_game())
+    clock[0] += 6
+    assert games.get('OLD') is None
+    assert games.get('NEW') is not None
+    assert games.evictions['waiting'] == 1
+
+
+def test_reads_keep_games_alive(clock):
+    games = MemoryGameStore(ttls={'waiting': 10})
+    games.put('ABC', waiting_game())
+    for _ in range(3):
+        clock[0] += 6
+        assert games.version('ABC') == 1
+
+
+def test_ttl_follows_phase(clock):
+    games = MemoryGameStore(ttls={'waiting': 10, 'finished': 100})
+    game = waiting_game()
+    game['state']['game_over'] = True
+    games.put('ABC', game)
+    clock[0] += 50
+    assert 'ABC' in games
+
+
+def test_lru_eviction(clock):
+    games = MemoryGameStore(max_games=2)
+    games.put('A', waiting_game())
+    clock[0] += 1
+    games.put('B', waiting_game())
+    clock[0] += 1
+    games.get('A')
+    clock[0] += 1
+    games.put('C', waiting_game())
+    assert 'B' not in games
+    assert 'A' in games and 'C' in games
+    assert games.evictions['lru'] == 1
+    assert len(games) == 2
+
+
+def test_shared_key_is_stable(games):
+    key = games.shared_key('game_codes')
+    assert len(key) == 16
+    assert games.shared_key('game_codes') == key
+    assert games.shared_key('other') != key
+
+
+def test_sqlite_workers_share_keys(tmp_path):
+    path = str(tmp_path / 'games.db')
+    assert SqliteGameStore(path).shared_key('game_codes') == SqliteGameStore(path).shared_key('game_codes')
+
+
+def test_copies_are_independent_of_the_stored_record(games):
+    game = waiting_game()
+    game['messages'] = [[1, 0, 'hi']]
+    game['changes'] = [[1, {'players': ['a']}]]
+    games.put('ABC', game)
+    copy = games.get('ABC')
+    copy['state']['players'].append('b')
+    copy['messages'][0] = [2, 0, 'replaced']
+    copy['changes'].append([2, {}])
+    stored = games.read('ABC')
+    assert stored['state']['players'] == ['a']
+    assert stored['messages'] == [[1, 0, 'hi']]
+    assert stored['changes'] == [[1, {'players': ['a']}]]
+
+
+def test_readers_keep_their_record_across_writes():
+    games = MemoryGameStore()
+    games.put('ABC', waiting_game())
+    seen = games.read('ABC')
+    assert games.read('ABC') is seen
+    game = games.get('ABC')
+    game['state']['players'].append('b')
+    assert games.compare_and_set('ABC', 1, game) == 2
+    assert seen['version'] == 1 and seen['state']['players'] == ['a']
+    assert games.read('ABC') is game
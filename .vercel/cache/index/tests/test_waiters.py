@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+import index
+from waiters import GameWaiters
+
+
+@pytest.fixture
+def client():
+    return index.app.test_client()
+
+
+def later(seconds, action):
+    timer = threading.Timer(seconds, action)
+    timer.start()
+    return timer
+
+
+def test_ready_returns_at_once():
+    assert GameWaiters().wait('ABC', lambda: True, 10)
+
+
+def test_times_out():
+    start = time.monotonic()
+    assert not GameWaiters(recheck_interval=0.01).wait('ABC', lambda: False, 0.05)
+    assert time.monotonic() - start >= 0.05
+
+
+def test_notify_wakes_waiters():
+    waiters = GameWaiters(recheck_interval=10)
+    changed = []
+    later(0.05, lambda: (changed.append(1), waiters.notify('ABC')))
+    start = time.monotonic()
+    assert waiters.wait('ABC', lambda: bool(changed), 5)
+    assert time.monotonic() - start < 1
+    assert waiters._conditions == {}
+
+
+def test_recheck_catches_writes_without_notify():
+    # Writes made by another worker process never call notify()
+    changed = []
+    later(0.05, lambda: changed.append(1))
+    assert GameWaiters(recheck_interval=0.01).wait('ABC', lambda: bool(changed), 5)
+
+
+def test_notify_without_waiters():
+    GameWaiters().notify('ABC')
+
+
+def new_game(client):
+    code = client.post('/create_game').get_json()['code']
+    client.post('/join_game', json={'code': code, 'player': 'a'})
+    return code
+
+
+def test_long_poll_times_out_with_304(client):
+    code = new_game(client)
+    version = index.games.version(code)
+    response = client.get(f'/game_state/{code}?since={version}&wait=50')
+    assert response.status_code == 304
+    assert response.headers['ETag'] == f'"{version}"'
+
+
+def test_long_poll_returns_on_write(client):
+    code = new_game(client)
+    version = index.games.version(code)
+    later(0.05, lambda: index.app.test_client().post('/join_game', json={'code': code, 'player': 'b'}))
+    start = time.monotonic()
+    response = client.get(f'/game_state/{code}?since={version}&wait=5000')
+    assert time.monotonic() - start < 2
+    assert response.status_code == 200
+    assert response.get_json()['version'] == version + 1
+    assert response.get_json()['state']['players'] == ['a', 'b']
+
+
+def test_long_poll_behind_returns_at_once(client):
+    code = new_game(client)
+    response = client.get(f'/game_state/{code}?since=0&wait=5000')
+    assert response.status_code == 200
+    assert response.get_json()['version'] == index.games.version(code)